@@ -0,0 +1,9 @@
+"""Herramientas de apoyo para los ejercicios del laboratorio de Ingeniería de Operaciones.
+
+Los módulos de este paquete reutilizan la misma configuración de los ejercicios
+de ``pandas`` e ``introduccion_prophet`` para trabajar con volúmenes de datos
+mayores (muchas series, muchos años, muchas figuras).
+
+Este archivo no importa Prophet ni Matplotlib: cada módulo carga sus
+dependencias pesadas solo cuando las necesita.
+"""
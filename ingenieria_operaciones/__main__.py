@@ -0,0 +1,529 @@
+"""Punto de entrada de línea de comandos: ``python -m ingenieria_operaciones <tarea>``.
+
+Este módulo solo importa la biblioteca estándar. pandas, Prophet y Matplotlib se
+cargan dentro de cada subcomando, de modo que una tarea de pandas no paga el
+costo de importar Prophet/cmdstan ni Matplotlib.
+
+Ejemplos::
+
+    python -m ingenieria_operaciones resumen --chunksize 100000
+    python -m ingenieria_operaciones pronostico --salida salidas --traza traza.jsonl
+    python -m ingenieria_operaciones ejercicio pandas/ejercicios04.py
+    python -m ingenieria_operaciones --profile-imports resumen
+"""
+
+import argparse
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSV_PRODUCCION = os.path.join(RAIZ, 'pandas', 'datos_produccion.csv')
+
+EJERCICIOS = {
+    'pandas-01': 'pandas/ejercicios01.py',
+    'pandas-02': 'pandas/ejercicios02.py',
+    'pandas-03': 'pandas/ejercicios03.py',
+    'pandas-04': 'pandas/ejercicios04.py',
+    'pandas-05': 'pandas/ejercicios05.py',
+    'prophet-01': 'introduccion_prophet/ejercicios01.py',
+    'prophet-02': 'introduccion_prophet/ejercicios02.py',
+}
+
+
+## Subcomandos
+
+def tarea_ejercicio(args):
+    """Ejecuta uno de los scripts originales tal cual."""
+    import runpy
+
+    ruta = EJERCICIOS.get(args.nombre, args.nombre)
+    if not os.path.isabs(ruta) and not os.path.exists(ruta):
+        ruta = os.path.join(RAIZ, ruta)
+    sys.argv = [ruta]
+    runpy.run_path(ruta, run_name='__main__')
+
+
+def tarea_resumen(args):
+    """Resumen por producto de ``datos_produccion.csv`` (pandas/ejercicios03.py)."""
+    if args.chunksize:
+        from .agregacion_streaming import agregar_produccion
+
+        df_agrupado = agregar_produccion(args.csv, chunksize=args.chunksize)
+    else:
+        if args.cache:
+            from .cache_columnar import cargar_produccion
+
+            datos_produccion = cargar_produccion(args.csv)
+        else:
+            import pandas as pd
+
+            datos_produccion = pd.read_csv(args.csv)
+        df_agrupado = datos_produccion.groupby(['Producto'], observed=True).agg(
+            Total_Producido=('Cantidad', 'sum'),
+            Total_Defectos=('Defectos', 'mean'),
+        )
+    print(df_agrupado)
+    if args.salida:
+        df_agrupado.to_csv(args.salida)
+        print(f"✓ Resumen guardado como '{args.salida}'")
+
+
+def tarea_pronostico(args):
+    """Flujo de introduccion_prophet/ejercicios01.py sin ventanas."""
+    from .pronostico import ejecutar
+
+    cache = None
+    if args.cache:
+        from .cache_modelos import CacheModelos
+
+        cache = CacheModelos(args.cache)
+    predicciones = ejecutar(args.salida, graficos=not args.sin_graficos,
+                            cache=cache, max_workers=args.procesos, intervalos=args.intervalos)
+    for nombre, prediccion in predicciones.items():
+        print(f"\nPredicción de {nombre}:")
+        print(prediccion[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail())
+
+
+def tarea_intervalos(args):
+    """Latencia y ancho de intervalo de cada estrategia de incertidumbre."""
+    import pandas as pd
+
+    from .intervalos import comparar_estrategias
+    from .pronostico import MODELOS, ajustar, generar_datos
+
+    df_demanda, df_produccion = generar_datos()
+    for nombre, df in (('demanda', df_demanda), ('produccion', df_produccion)):
+        _, periodos, freq = MODELOS[nombre][:3]
+        modelo = ajustar(nombre, df)
+        futuro = modelo.make_future_dataframe(periods=periodos * args.multiplicador, freq=freq)
+        with pd.option_context('display.float_format', '{:.4f}'.format):
+            print(f"\nModelo de {nombre} ({len(futuro)} filas):")
+            print(comparar_estrategias(modelo, futuro, muestras=args.muestras))
+
+    if args.verificar_flujo:
+        import tempfile
+
+        from .intervalos import ESTRATEGIAS
+        from .pronostico import ejecutar
+
+        # cada estrategia por el flujo completo de 'pronostico', gráficos incluidos
+        for estrategia in ESTRATEGIAS:
+            with tempfile.TemporaryDirectory() as directorio:
+                ejecutar(directorio, max_workers=1, intervalos=estrategia)
+            print(f"✓ Flujo de pronóstico con intervalos '{estrategia}'")
+
+
+def tarea_reajuste(args):
+    """Reajustes tibios al llegar observaciones nuevas frente a ajustes en frío."""
+    import pandas as pd
+
+    from .pronostico import ajustar, generar_datos
+    from .reajuste_incremental import reajustar
+
+    df_demanda, df_produccion = generar_datos()
+    for nombre, df in (('demanda', df_demanda), ('produccion', df_produccion)):
+        inicial = len(df) - args.pasos * args.lote
+        modelo = ajustar(nombre, df.iloc[:inicial])
+        informes = []
+        for fin in range(inicial + args.lote, len(df) + 1, args.lote):
+            modelo, informe = reajustar(modelo, df.iloc[:fin], comparar=True)
+            informes.append(informe)
+        informes = pd.DataFrame(informes)
+        print(f"\nModelo de {nombre}: {len(informes)} reajustes de {args.lote} observaciones")
+        print(informes['modo'].value_counts().to_string())
+        tibios = informes[informes['modo'] == 'tibio']
+        if not tibios.empty:
+            print(f"✓ Iteraciones: {int(tibios['iteraciones'].sum())} tibias vs {int(tibios['iteraciones_frio'].sum())} en frío; "
+                  f"tiempo ahorrado {tibios['ahorro_segundos'].sum():.2f} s")
+
+
+def tarea_barrido_cps(args):
+    """Barrido de ``changepoint_prior_scale`` de introduccion_prophet/ejercicios02.py."""
+    from .barrido_cps import barrido_cps
+    from .pronostico import generar_datos
+
+    df_demanda, _ = generar_datos()
+    modelos = barrido_cps(df_demanda, args.valores, periodos=args.periodos, max_workers=args.procesos)
+    for cps, forecast in modelos.items():
+        print(f"CPS = {cps}: yhat final = {forecast['yhat'].iloc[-1]:.2f}")
+    if args.grafico:
+        from .renderizado import Figura, grafico_comparacion_cps, renderizar
+
+        renderizar(Figura(args.grafico, grafico_comparacion_cps, (df_demanda, modelos)))
+        print(f"✓ Gráfico de comparación guardado como '{args.grafico}'")
+
+
+def tarea_validacion(args):
+    """Validación cruzada del modelo de demanda, opcionalmente por valor de cps."""
+    import pandas as pd
+
+    from .modelos import CONFIG_DEMANDA
+    from .pronostico import generar_datos
+    from .validacion_cruzada import metricas, validacion_cruzada
+
+    df_demanda, _ = generar_datos()
+    resumen = {}
+    for cps in args.cps or [None]:
+        config = dict(CONFIG_DEMANDA)
+        if cps is not None:
+            config['changepoint_prior_scale'] = cps
+        cv = validacion_cruzada(df_demanda, args.horizonte, args.periodo, args.inicial,
+                                config=config, max_workers=args.procesos, directorio_cache=args.cache)
+        tabla = metricas(cv)
+        if cps is None:
+            print(tabla)
+        resumen[cps] = tabla.mean()
+    if args.cps:
+        print(pd.DataFrame(resumen).T.rename_axis('changepoint_prior_scale'))
+
+
+def tarea_busqueda(args):
+    """Búsqueda por reducción sucesiva de cps, escala y modo de estacionalidad."""
+    from .busqueda_hiperparametros import grilla, reduccion_sucesiva
+    from .pronostico import generar_datos
+
+    df_demanda, _ = generar_datos()
+    configs = grilla(changepoint_prior_scale=args.cps,
+                     seasonality_prior_scale=args.escalas,
+                     seasonality_mode=args.modos)
+    modelos, registro = reduccion_sucesiva(df_demanda, configs, eta=args.eta,
+                                           n_ganadores=args.ganadores, max_workers=args.procesos,
+                                           directorio_cache=args.cache)
+    print(registro.to_string(index=False))
+    for llave, forecast in modelos.items():
+        print(f"Ganador {llave}: yhat final = {forecast['yhat'].iloc[-1]:.2f}")
+    if args.registro:
+        registro.to_csv(args.registro, index=False)
+
+
+def tarea_pronostico_lote(args):
+    """Pronóstico de cada ``Producto`` de ``datos_produccion.csv``."""
+    import pandas as pd
+
+    from .pronostico_lote import pronosticar_lote, serie_larga_produccion
+
+    df_largo = serie_larga_produccion(pd.read_csv(args.csv))
+    pronostico, errores = pronosticar_lote(df_largo, periodos=args.periodos, max_workers=args.procesos)
+    for id_serie, error in errores.items():
+        print(f"✗ {id_serie}: {error}")
+    pronostico.to_csv(args.salida, index=False)
+    print(f"✓ Pronóstico de {pronostico['Producto'].nunique()} series guardado como '{args.salida}'")
+
+
+def tarea_proveedores(args):
+    """Frontera de Pareto y ranking de proveedores: vectorizado frente a ingenuo."""
+    from .proveedores import comparar
+
+    tiempos = comparar(args.materiales, args.ofertas)
+    for nombre, segundos in tiempos.items():
+        print(f"{nombre:<22}{segundos:10.4f} s")
+    print(f"✓ Pareto {tiempos['pareto_ingenuo'] / tiempos['pareto_vectorizado']:.0f}x, "
+          f"ranking {tiempos['ranking_ingenuo'] / tiempos['ranking_vectorizado']:.0f}x más rápido")
+
+
+def tarea_dimensiones(args):
+    """Enriquecimiento con la tabla de materiales (``df2``): índice frente a ``pd.merge``."""
+    import pandas as pd
+
+    from .dimensiones import comparar, verificar_nulos
+
+    df2 = pd.DataFrame({
+        "Material": ["Acero", "Aluminio", "Cobre", "Acero"],
+        "Costo_Kg": [2.5, 3.0, 4.0, 2.5],
+        "Proveedor": pd.Categorical(["A", "B", "A", "C"]),
+    })
+    verificar_nulos(df2, 'Material')
+    print("✓ Claves nulas: mismo resultado que pd.merge")
+    for categorica in (True, False):
+        tiempos = comparar(df2, 'Material', n_filas=args.filas, lotes=args.lotes, how=args.how,
+                           categorica=categorica)
+        tipo = 'categórica' if categorica else 'texto'
+        print(f"✓ Clave {tipo}: índice {tiempos['indice']:.2f} s, merge {tiempos['merge']:.2f} s "
+              f"({tiempos['aceleracion']:.1f}x)")
+
+
+def tarea_grupos(args):
+    """Agregaciones repetidas con un índice de grupos frente a ``groupby``."""
+    from .indice_grupos import comparar, datos_sinteticos
+
+    datos = datos_sinteticos(args.filas)
+    for claves in (['Producto'], ['Departamento'], ['Producto', 'Departamento', 'Proveedor']):
+        tiempos = comparar(datos, claves)
+        print(f"✓ {', '.join(claves)}: índice {tiempos['indice']:.2f} s, groupby {tiempos['groupby']:.2f} s "
+              f"({tiempos['aceleracion']:.1f}x)")
+
+
+def tarea_plantas(args):
+    """Pronóstico de varias plantas en secuencia y con etapas concurrentes."""
+    from .flujo_plantas import ejecutar_concurrente, ejecutar_secuencial, preparar_plantas
+
+    plantas = preparar_plantas(os.path.join(args.salida, 'datos'), args.plantas, horas=args.horas)
+    graficos = not args.sin_graficos
+    secuencial, tiempos_secuencial = ejecutar_secuencial(plantas, os.path.join(args.salida, 'secuencial'), graficos)
+    concurrente, tiempos_concurrente = ejecutar_concurrente(
+        plantas, os.path.join(args.salida, 'concurrente'), graficos,
+        procesos=args.procesos, hilos=args.hilos, capacidad=args.capacidad)
+
+    for nombre, prediccion in secuencial.items():
+        if not prediccion.equals(concurrente[nombre]):
+            raise AssertionError(f"La predicción de {nombre} no coincide entre ambos caminos")
+    for camino, tiempos in (('secuencial', tiempos_secuencial), ('concurrente', tiempos_concurrente)):
+        etapas = ', '.join(f'{etapa} {segundos:.1f} s' for etapa, segundos in tiempos.items() if etapa != 'total')
+        print(f"✓ {camino}: {tiempos['total']:.1f} s ({etapas})")
+    print(f"✓ {len(plantas)} plantas con predicciones idénticas "
+          f"({tiempos_secuencial['total'] / tiempos_concurrente['total']:.1f}x)")
+
+
+def tarea_tiempos(args):
+    """Estadísticos e histograma de tiempos de ciclo leyendo uno o varios CSV por bloques."""
+    from .distribucion_streaming import resumir_archivos
+    from .renderizado import Figura, grafico_tiempos_resumen, renderizar
+
+    resumen = resumir_archivos(args.csv, columna=args.columna, chunksize=args.chunksize,
+                               max_workers=args.procesos)
+    print(resumen.describe())
+    renderizar(Figura(args.salida, grafico_tiempos_resumen, (resumen,)))
+    print(f"✓ Gráfico de tiempos guardado como '{args.salida}'")
+
+
+def tarea_graficos(args):
+    """Figuras de pandas/ejercicios05.py renderizadas en paralelo."""
+    import numpy as np
+    import pandas as pd
+
+    from .renderizado import (Figura, grafico_costos_proveedor, grafico_produccion_diaria,
+                              grafico_tiempos_ciclo, renderizar_lote)
+
+    np.random.seed(1405)
+    produccion_diaria = pd.Series(
+        np.random.randint(80, 150, size=30),
+        index=pd.date_range('2024-01-01', periods=30, freq='D'),
+        name="Producción"
+    )
+    datos_costos = pd.DataFrame({
+        'Proveedor': ['A', 'B', 'C', 'D'],
+        'Costo_Promedio': [10.5, 9.8, 11.2, 10.1],
+        'Tiempo_Entrega': [3.2, 4.1, 2.9, 3.8]
+    })
+    tiempos_ciclo = pd.DataFrame({'Tiempo': np.random.normal(loc=5, scale=1, size=100)})
+
+    os.makedirs(args.salida, exist_ok=True)
+    renderizar_lote([
+        Figura(os.path.join(args.salida, 'produccion_diaria.png'), grafico_produccion_diaria, (produccion_diaria,)),
+        Figura(os.path.join(args.salida, 'costo_promedio_proveedor.png'), grafico_costos_proveedor, (datos_costos,)),
+        Figura(os.path.join(args.salida, 'distribucion_tiempos_ciclo.png'), grafico_tiempos_ciclo, (tiempos_ciclo,)),
+    ], max_workers=args.procesos)
+
+
+def tarea_servicio(args):
+    """Servicio HTTP local de pronósticos (ver ``ingenieria_operaciones.servicio``)."""
+    from .servicio import main as main_servicio
+
+    return main_servicio(args.argumentos)
+
+
+def tarea_benchmark(args):
+    """Suite de benchmarks (ver ``ingenieria_operaciones.benchmarks``)."""
+    from .benchmarks import main as main_benchmarks
+
+    return main_benchmarks(args.argumentos)
+
+
+REENVIO = ('servicio', 'benchmark')
+
+
+## Perfil de importaciones
+
+def perfilar_importaciones(argv, top=15):
+    """Ejecuta la tarea con ``-X importtime`` y muestra los módulos más costosos."""
+    import re
+    import subprocess
+
+    comando = [sys.executable, '-X', 'importtime', '-m', 'ingenieria_operaciones'] + argv
+    proceso = subprocess.run(comando, stderr=subprocess.PIPE, text=True)
+
+    patron = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+    tiempos = []
+    for linea in proceso.stderr.splitlines():
+        if linea.startswith('import time: self'):
+            continue
+        coincidencia = patron.match(linea)
+        if coincidencia is None:
+            sys.stderr.write(linea + '\n')
+            continue
+        propio, acumulado, sangria, modulo = coincidencia.groups()
+        if len(sangria) == 1:  # solo importaciones de primer nivel
+            tiempos.append((int(acumulado), modulo))
+
+    total = sum(t for t, _ in tiempos)
+    print(f"\nTiempo total de importación: {total / 1e6:.3f} s", file=sys.stderr)
+    for acumulado, modulo in sorted(tiempos, reverse=True)[:top]:
+        print(f"  {acumulado / 1e6:8.3f} s  {modulo}", file=sys.stderr)
+    return proceso.returncode
+
+
+## Argumentos
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m ingenieria_operaciones',
+        description='Tareas del laboratorio de Ingeniería de Operaciones.',
+    )
+    parser.add_argument('--profile-imports', action='store_true',
+                        help='muestra cuánto tarda cada importación de la tarea')
+    parser.add_argument('--traza', metavar='RUTA',
+                        help="escribe la traza de etapas en RUTA (.jsonl) o '-' para stderr")
+    parser.add_argument('--sin-ventanas', action='store_true',
+                        help='usa el backend Agg de Matplotlib: plt.show() no bloquea')
+    sub = parser.add_subparsers(dest='tarea', required=True)
+
+    p = sub.add_parser('ejercicio', help=tarea_ejercicio.__doc__)
+    p.add_argument('nombre', help=f"ruta del script o uno de: {', '.join(EJERCICIOS)}")
+    p.set_defaults(funcion=tarea_ejercicio)
+
+    p = sub.add_parser('resumen', help=tarea_resumen.__doc__)
+    p.add_argument('--csv', default=CSV_PRODUCCION)
+    p.add_argument('--chunksize', type=int, help='lee el CSV por bloques de este tamaño')
+    p.add_argument('--cache', action='store_true', help='usa el caché columnar Feather')
+    p.add_argument('--salida', default='resumen_produccion.csv')
+    p.set_defaults(funcion=tarea_resumen)
+
+    p = sub.add_parser('pronostico', help=tarea_pronostico.__doc__)
+    p.add_argument('--salida', default='.')
+    p.add_argument('--cache', metavar='DIRECTORIO', help='caché de modelos entrenados')
+    p.add_argument('--sin-graficos', action='store_true')
+    p.add_argument('--procesos', type=int)
+    p.add_argument('--intervalos', default='completa',
+                   choices=['completa', 'reducida', 'analitica', 'puntual'],
+                   help='estrategia para yhat_lower/yhat_upper')
+    p.set_defaults(funcion=tarea_pronostico)
+
+    p = sub.add_parser('intervalos', help=tarea_intervalos.__doc__)
+    p.add_argument('--muestras', type=int, default=100, help="muestras de la estrategia 'reducida'")
+    p.add_argument('--multiplicador', type=int, default=1, help='multiplica el horizonte del ejercicio')
+    p.add_argument('--verificar-flujo', action='store_true',
+                   help="corre el flujo de 'pronostico' completo con cada estrategia")
+    p.set_defaults(funcion=tarea_intervalos)
+
+    p = sub.add_parser('reajuste', help=tarea_reajuste.__doc__)
+    p.add_argument('--pasos', type=int, default=10, help='número de reajustes')
+    p.add_argument('--lote', type=int, default=1, help='observaciones nuevas por reajuste')
+    p.set_defaults(funcion=tarea_reajuste)
+
+    p = sub.add_parser('barrido-cps', help=tarea_barrido_cps.__doc__)
+    p.add_argument('--valores', nargs='+', type=float, default=[0.001, 0.01, 0.1, 0.5])
+    p.add_argument('--periodos', type=int, default=30)
+    p.add_argument('--procesos', type=int)
+    p.add_argument('--grafico', default='comparacion_cps.png')
+    p.set_defaults(funcion=tarea_barrido_cps)
+
+    p = sub.add_parser('validacion', help=tarea_validacion.__doc__)
+    p.add_argument('--horizonte', default='14 days')
+    p.add_argument('--periodo', default='7 days')
+    p.add_argument('--inicial', default='56 days')
+    p.add_argument('--cps', nargs='+', type=float, help='compara estos valores de changepoint_prior_scale')
+    p.add_argument('--procesos', type=int)
+    p.add_argument('--cache', default='.cache_modelos', help='directorio del caché de cortes')
+    p.set_defaults(funcion=tarea_validacion)
+
+    p = sub.add_parser('busqueda', help=tarea_busqueda.__doc__)
+    p.add_argument('--cps', nargs='+', type=float, default=[0.001, 0.01, 0.1, 0.5])
+    p.add_argument('--escalas', nargs='+', type=float, default=[10.0],
+                   help='valores de seasonality_prior_scale')
+    p.add_argument('--modos', nargs='+', default=['additive'], choices=['additive', 'multiplicative'])
+    p.add_argument('--eta', type=int, default=3)
+    p.add_argument('--ganadores', type=int, default=1)
+    p.add_argument('--procesos', type=int)
+    p.add_argument('--cache', default='.cache_modelos')
+    p.add_argument('--registro', help='CSV donde guardar el registro de la búsqueda')
+    p.set_defaults(funcion=tarea_busqueda)
+
+    p = sub.add_parser('pronostico-lote', help=tarea_pronostico_lote.__doc__)
+    p.add_argument('--csv', default=CSV_PRODUCCION)
+    p.add_argument('--periodos', type=int, default=30)
+    p.add_argument('--procesos', type=int)
+    p.add_argument('--salida', default='pronostico_productos.csv')
+    p.set_defaults(funcion=tarea_pronostico_lote)
+
+    p = sub.add_parser('proveedores', help=tarea_proveedores.__doc__)
+    p.add_argument('--materiales', type=int, default=200)
+    p.add_argument('--ofertas', type=int, default=50, help="ofertas por material")
+    p.set_defaults(funcion=tarea_proveedores)
+
+    p = sub.add_parser('dimensiones', help=tarea_dimensiones.__doc__)
+    p.add_argument('--filas', type=int, default=1_000_000, help='filas por lote')
+    p.add_argument('--lotes', type=int, default=5)
+    p.add_argument('--how', choices=['inner', 'left'], default='left')
+    p.set_defaults(funcion=tarea_dimensiones)
+
+    p = sub.add_parser('grupos', help=tarea_grupos.__doc__)
+    p.add_argument('--filas', type=int, default=1_000_000)
+    p.set_defaults(funcion=tarea_grupos)
+
+    p = sub.add_parser('plantas', help=tarea_plantas.__doc__)
+    p.add_argument('--plantas', type=int, default=8)
+    p.add_argument('--horas', type=int, default=24*30)
+    p.add_argument('--salida', default='salidas_plantas')
+    p.add_argument('--procesos', type=int)
+    p.add_argument('--hilos', type=int, default=4)
+    p.add_argument('--capacidad', type=int, default=4)
+    p.add_argument('--sin-graficos', action='store_true')
+    p.set_defaults(funcion=tarea_plantas)
+
+    p = sub.add_parser('tiempos', help=tarea_tiempos.__doc__)
+    p.add_argument('csv', nargs='+')
+    p.add_argument('--columna', default='Tiempo')
+    p.add_argument('--chunksize', type=int, default=1_000_000)
+    p.add_argument('--procesos', type=int)
+    p.add_argument('--salida', default='distribucion_tiempos_ciclo.png')
+    p.set_defaults(funcion=tarea_tiempos)
+
+    p = sub.add_parser('graficos', help=tarea_graficos.__doc__)
+    p.add_argument('--salida', default='.')
+    p.add_argument('--procesos', type=int)
+    p.set_defaults(funcion=tarea_graficos)
+
+    p = sub.add_parser('servicio', help=tarea_servicio.__doc__)
+    p.set_defaults(funcion=tarea_servicio)
+
+    p = sub.add_parser('benchmark', help=tarea_benchmark.__doc__)
+    p.set_defaults(funcion=tarea_benchmark)
+
+    return parser
+
+
+def _posicion_subcomando(parser, argv):
+    """Posición del subcomando en ``argv``, saltando las opciones globales y sus valores."""
+    i = 0
+    while i < len(argv) and argv[i].startswith('-'):
+        opcion = argv[i].split('=', 1)[0]
+        accion = parser._option_string_actions.get(opcion)
+        toma_valor = accion is not None and accion.nargs != 0 and '=' not in argv[i]
+        i += 2 if toma_valor else 1
+    return i if i < len(argv) else None
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = crear_parser()
+    # 'servicio' y 'benchmark' reenvían todo lo que sigue al módulo correspondiente
+    reenviados = []
+    posicion = _posicion_subcomando(parser, argv)
+    if posicion is not None and argv[posicion] in REENVIO:
+        argv, reenviados = argv[:posicion + 1], argv[posicion + 1:]
+    args = parser.parse_args(argv)
+    args.argumentos = reenviados
+
+    if args.profile_imports:
+        return perfilar_importaciones([a for a in argv if a != '--profile-imports'] + reenviados)
+    if args.sin_ventanas:
+        os.environ['MPLBACKEND'] = 'Agg'
+    if args.traza:
+        from .instrumentacion import activar
+
+        activar(args.traza)
+    return args.funcion(args) or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""Agregación por producto de ``datos_produccion.csv`` leyendo por bloques.
+
+Produce el mismo ``df_agrupado`` que ``pandas/ejercicios03.py``::
+
+    datos_produccion.groupby(['Producto']).agg(
+        Total_Producido=('Cantidad', 'sum'),
+        Total_Defectos=('Defectos', 'mean'),
+    )
+
+pero sin cargar el archivo completo: de cada bloque solo se conservan la suma
+de ``Cantidad`` y la suma y el conteo de ``Defectos`` por producto, de modo que
+la memoria depende del número de productos y no del número de filas.
+"""
+
+import time
+
+import pandas as pd
+
+from .instrumentacion import etapa
+
+
+def agregar_produccion(ruta, chunksize=100_000, reportar=print):
+    """Agrupa ``ruta`` por ``Producto`` leyendo ``chunksize`` filas a la vez.
+
+    ``reportar`` recibe un texto con el avance (filas y filas/s) después de
+    cada bloque; con ``None`` no se informa nada.
+    """
+    parciales = None
+    filas = 0
+    inicio = time.perf_counter()
+
+    with etapa('agregacion_csv', ruta=str(ruta)) as e:
+        for bloque in pd.read_csv(ruta, usecols=['Producto', 'Cantidad', 'Defectos'],
+                                  chunksize=chunksize):
+            grupos = bloque.groupby('Producto')
+            parcial = pd.DataFrame({
+                'Total_Producido': grupos['Cantidad'].sum(),
+                'Suma_Defectos': grupos['Defectos'].sum(),
+                'Conteo_Defectos': grupos['Defectos'].count(),
+            })
+            if parciales is None:
+                parciales = parcial
+            else:
+                parciales = pd.concat([parciales, parcial]).groupby(level=0).sum()
+
+            filas += len(bloque)
+            if reportar is not None:
+                segundos = time.perf_counter() - inicio
+                reportar(f"{filas:,} filas leídas ({filas / max(segundos, 1e-9):,.0f} filas/s)")
+        e.filas(filas)
+
+    if parciales is None:
+        return pd.DataFrame(
+            {'Total_Producido': pd.Series(dtype='int64'),
+             'Total_Defectos': pd.Series(dtype='float64')},
+            index=pd.Index([], name='Producto'),
+        )
+
+    df_agrupado = pd.DataFrame({
+        'Total_Producido': parciales['Total_Producido'],
+        'Total_Defectos': parciales['Suma_Defectos'] / parciales['Conteo_Defectos'],
+    })
+    df_agrupado.index.name = 'Producto'
+    return df_agrupado.sort_index()
@@ -0,0 +1,221 @@
+"""Agregación incremental de la serie de demanda diaria.
+
+``pandas/ejercicios04.py`` calcula sobre toda la historia::
+
+    demanda.rolling(window=7).mean()
+    demanda.diff()
+    demanda.shift(1)
+    demanda.resample('W').sum()
+    demanda.resample('ME').sum()
+
+:class:`AgregadorDemanda` recibe las observaciones una a una y actualiza cada
+resultado en O(1) por punto. Las sumas reproducen la suma compensada (Kahan)
+que usa pandas internamente, de modo que los valores coinciden exactamente con
+los de pandas y no solo aproximadamente.
+
+Ejemplo::
+
+    agregador = AgregadorDemanda(ventana=7)
+    agregador.agregar_serie(demanda)
+    agregador.agregar(pd.Timestamp('2024-01-31'), 120)
+    agregador.media_movil().tail()
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+
+class _SumaKahan:
+    """Suma compensada igual a la de ``groupby(...).sum()`` de pandas."""
+
+    __slots__ = ('suma', 'compensacion')
+
+    def __init__(self, suma=0.0):
+        self.suma = suma
+        self.compensacion = 0.0
+
+    def agregar(self, valor):
+        y = valor - self.compensacion
+        t = self.suma + y
+        self.compensacion = t - self.suma - y
+        if self.compensacion != self.compensacion:  # inf - inf
+            self.compensacion = 0.0
+        self.suma = t
+
+
+class _MediaMovil:
+    """Media móvil de ventana fija con la actualización de ``rolling().mean()``.
+
+    pandas suma los valores que entran y resta los que salen con dos
+    compensaciones de Kahan separadas, corrige el signo cuando todos los
+    valores tienen el mismo y devuelve el valor exacto cuando la ventana es
+    constante; aquí se replica esa misma secuencia de operaciones.
+    """
+
+    def __init__(self, ventana):
+        self.ventana = ventana
+        self.valores = deque()
+        self.nobs = 0
+        self.suma = 0.0
+        self.negativos = 0
+        self.comp_suma = 0.0
+        self.comp_resta = 0.0
+        self.consecutivos = 0
+        self.anterior = None
+
+    def _sumar(self, valor):
+        if math.isnan(valor):
+            return
+        self.nobs += 1
+        y = valor - self.comp_suma
+        t = self.suma + y
+        self.comp_suma = t - self.suma - y
+        self.suma = t
+        if math.copysign(1.0, valor) < 0:
+            self.negativos += 1
+        if valor == self.anterior:
+            self.consecutivos += 1
+        else:
+            self.consecutivos = 1
+        self.anterior = valor
+
+    def _restar(self, valor):
+        if math.isnan(valor):
+            return
+        self.nobs -= 1
+        y = -valor - self.comp_resta
+        t = self.suma + y
+        self.comp_resta = t - self.suma - y
+        self.suma = t
+        if math.copysign(1.0, valor) < 0:
+            self.negativos -= 1
+
+    def agregar(self, valor):
+        if not self.valores:
+            self.anterior = valor
+        self.valores.append(valor)
+        if len(self.valores) > self.ventana:
+            self._restar(self.valores.popleft())
+        self._sumar(valor)
+
+        if self.nobs < self.ventana or self.nobs == 0:
+            return np.nan
+        resultado = self.suma / self.nobs
+        if self.consecutivos >= self.nobs:
+            resultado = self.anterior
+        elif self.negativos == 0 and resultado < 0:
+            resultado = 0.0
+        elif self.negativos == self.nobs and resultado > 0:
+            resultado = 0.0
+        return resultado
+
+
+def _fin_de_semana(fecha):
+    """Etiqueta de ``resample('W')``: el domingo que cierra la semana."""
+    fecha = fecha.normalize()
+    return fecha + pd.Timedelta(days=6 - fecha.dayofweek)
+
+
+def _fin_de_mes(fecha):
+    """Etiqueta de ``resample('ME')``: el último día del mes."""
+    return pd.Timestamp(fecha.year, fecha.month, fecha.days_in_month)
+
+
+class AgregadorDemanda:
+    """Mantiene la media móvil, ``diff``, ``shift`` y totales semanales y mensuales.
+
+    Las fechas deben llegar en orden estrictamente creciente. Si todas las
+    observaciones son enteras los totales se acumulan como enteros, igual que
+    ``resample(...).sum()`` sobre una serie ``int64``.
+    """
+
+    def __init__(self, ventana=7):
+        self.ventana = ventana
+        self._media = _MediaMovil(ventana)
+        self._fechas = []
+        self._medias = []
+        self._diferencias = []
+        self._desplazados = []
+        self._semanas = {}
+        self._meses = {}
+        self._enteros = True
+        self._ultimo = None
+
+    def agregar(self, fecha, valor):
+        """Incorpora la observación ``valor`` del día ``fecha``."""
+        fecha = pd.Timestamp(fecha)
+        if self._fechas and fecha <= self._fechas[-1]:
+            raise ValueError(f"La fecha {fecha} no es posterior a {self._fechas[-1]}")
+
+        es_entero = isinstance(valor, (int, np.integer)) and not isinstance(valor, bool)
+        if self._enteros and not es_entero:
+            self._pasar_a_flotante()
+        valor_float = float(valor)
+
+        self._medias.append(self._media.agregar(valor_float))
+        if self._ultimo is None:
+            self._diferencias.append(np.nan)
+            self._desplazados.append(np.nan)
+        else:
+            self._diferencias.append(valor_float - self._ultimo)
+            self._desplazados.append(self._ultimo)
+        self._ultimo = valor_float
+        self._fechas.append(fecha)
+
+        for totales, etiqueta in ((self._semanas, _fin_de_semana(fecha)),
+                                  (self._meses, _fin_de_mes(fecha))):
+            if self._enteros:
+                totales[etiqueta] = totales.get(etiqueta, 0) + int(valor)
+            elif not math.isnan(valor_float):
+                totales.setdefault(etiqueta, _SumaKahan()).agregar(valor_float)
+            else:
+                totales.setdefault(etiqueta, _SumaKahan())
+
+    def agregar_serie(self, serie):
+        """Incorpora todos los puntos de una ``Series`` indexada por fecha."""
+        for fecha, valor in zip(serie.index, serie.tolist()):
+            self.agregar(fecha, valor)
+
+    def _pasar_a_flotante(self):
+        self._enteros = False
+        for totales in (self._semanas, self._meses):
+            for etiqueta, total in totales.items():
+                totales[etiqueta] = _SumaKahan(float(total))
+
+    ## Vistas equivalentes a las de pandas
+
+    def _indice(self):
+        return pd.DatetimeIndex(self._fechas)
+
+    def media_movil(self):
+        """Equivale a ``demanda.rolling(window=ventana).mean()``."""
+        return pd.Series(self._medias, index=self._indice(), dtype='float64')
+
+    def diferencias(self):
+        """Equivale a ``demanda.diff()``."""
+        return pd.Series(self._diferencias, index=self._indice(), dtype='float64')
+
+    def desplazado(self):
+        """Equivale a ``demanda.shift(1)``."""
+        return pd.Series(self._desplazados, index=self._indice(), dtype='float64')
+
+    def _totales(self, totales, freq):
+        if not totales:
+            return pd.Series(dtype='int64' if self._enteros else 'float64')
+        etiquetas = pd.date_range(min(totales), max(totales), freq=freq)
+        if self._enteros:
+            valores = [totales.get(e, 0) for e in etiquetas]
+            return pd.Series(valores, index=etiquetas, dtype='int64')
+        valores = [totales[e].suma if e in totales else 0.0 for e in etiquetas]
+        return pd.Series(valores, index=etiquetas, dtype='float64')
+
+    def totales_semanales(self):
+        """Equivale a ``demanda.resample('W').sum()``."""
+        return self._totales(self._semanas, 'W')
+
+    def totales_mensuales(self):
+        """Equivale a ``demanda.resample('ME').sum()``."""
+        return self._totales(self._meses, 'ME')
@@ -0,0 +1,216 @@
+"""Almacén en disco, particionado por mes, para historia horaria de producción.
+
+Cada línea de producción se guarda como un archivo ``.npy`` por mes
+(``<directorio>/<linea>/2024-01.npy``) con una posición por hora del mes; las
+horas que aún no llegan quedan en ``NaN``. Un ``rango.json`` por línea guarda
+la primera y la última hora escritas, que limitan las lecturas. Los archivos se abren con
+``np.load(..., mmap_mode=...)``, de modo que:
+
+* una lectura por rango de fechas solo abre los meses que toca y, si cae en un
+  solo mes, entrega a pandas una vista sin copia del archivo mapeado;
+* ``resample`` agrega mes por mes y combina los parciales, sin cargar la
+  historia completa;
+* agregar horas nuevas escribe solo en la partición de su mes, sin reescribir
+  las demás.
+
+Ejemplo::
+
+    almacen = AlmacenHorario('historia_produccion')
+    almacen.agregar('linea_1', df_produccion.set_index('ds')['y'])
+    ts = almacen.linea('linea_1')
+    ts['2024-01-03':'2024-01-07']
+    ts.resample('W')
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .serie_compacta import intervalo_fecha
+
+AGREGACIONES = ('sum', 'count', 'min', 'max', 'mean')
+
+
+class AlmacenHorario:
+    """Colección de líneas con particiones mensuales mapeadas en memoria."""
+
+    def __init__(self, directorio, paso='h', dtype='float32'):
+        self.directorio = directorio
+        os.makedirs(directorio, exist_ok=True)
+        ruta_meta = os.path.join(directorio, 'almacen.json')
+        if os.path.exists(ruta_meta):
+            with open(ruta_meta, 'r', encoding='utf-8') as archivo:
+                meta = json.load(archivo)
+        else:
+            meta = {'paso': str(pd.Timedelta(pd.tseries.frequencies.to_offset(paso))), 'dtype': np.dtype(dtype).str}
+            with open(ruta_meta, 'w', encoding='utf-8') as archivo:
+                json.dump(meta, archivo)
+        self.paso = pd.Timedelta(meta['paso'])
+        self.dtype = np.dtype(meta['dtype'])
+        if pd.Timedelta(days=1) % self.paso:
+            raise ValueError("El paso debe dividir exactamente un día")
+
+    ## Particiones
+
+    def lineas(self):
+        """Nombres de las líneas guardadas."""
+        return sorted(e.name for e in os.scandir(self.directorio) if e.is_dir())
+
+    def meses(self, linea):
+        """Meses (``pd.Period``) con partición para ``linea``."""
+        directorio = os.path.join(self.directorio, linea)
+        if not os.path.isdir(directorio):
+            return []
+        return sorted(pd.Period(nombre[:-4], freq='M')
+                      for nombre in os.listdir(directorio) if nombre.endswith('.npy'))
+
+    def rango(self, linea):
+        """Primera y última fecha escritas en ``linea`` (o ``None``)."""
+        ruta = os.path.join(self.directorio, linea, 'rango.json')
+        if not os.path.exists(ruta):
+            return None
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            primero, ultimo = json.load(archivo)
+        return pd.Timestamp(primero), pd.Timestamp(ultimo)
+
+    def _guardar_rango(self, linea, primero, ultimo):
+        anterior = self.rango(linea)
+        if anterior is not None:
+            primero, ultimo = min(primero, anterior[0]), max(ultimo, anterior[1])
+        with open(os.path.join(self.directorio, linea, 'rango.json'), 'w', encoding='utf-8') as archivo:
+            json.dump([primero.isoformat(), ultimo.isoformat()], archivo)
+
+    def _ruta(self, linea, mes):
+        return os.path.join(self.directorio, linea, f'{mes.strftime("%Y-%m")}.npy')
+
+    def _largo(self, mes):
+        return int((mes.end_time.normalize() + pd.Timedelta(days=1) - mes.start_time) / self.paso)
+
+    def _indice(self, mes, desde, hasta):
+        return pd.date_range(mes.start_time + self.paso * desde, periods=hasta - desde, freq=self.paso)
+
+    ## Escritura
+
+    def agregar(self, linea, serie):
+        """Escribe los valores de ``serie`` (indexada por fecha) en ``linea``.
+
+        Solo se abren las particiones de los meses presentes en ``serie``; los
+        meses nuevos se crean llenos de ``NaN``. Las horas ya existentes se
+        sobrescriben.
+        """
+        indice = pd.DatetimeIndex(serie.index)
+        valores = np.asarray(serie, dtype=self.dtype)
+        if len(indice) == 0:
+            return
+        os.makedirs(os.path.join(self.directorio, linea), exist_ok=True)
+
+        meses = indice.to_period('M')
+        for mes in meses.unique():
+            seleccion = meses == mes
+            desplazamiento = (indice[seleccion] - mes.start_time) / self.paso
+            posiciones = np.asarray(desplazamiento)
+            if not np.array_equal(posiciones, np.floor(posiciones)):
+                raise ValueError(f"Hay fechas de {mes} que no están alineadas al paso {self.paso}")
+
+            ruta = self._ruta(linea, mes)
+            if os.path.exists(ruta):
+                particion = np.load(ruta, mmap_mode='r+')
+            else:
+                particion = np.lib.format.open_memmap(ruta, mode='w+', dtype=self.dtype,
+                                                      shape=(self._largo(mes),))
+                particion[:] = np.nan
+            particion[posiciones.astype(np.int64)] = valores[seleccion]
+            particion.flush()
+            del particion
+        self._guardar_rango(linea, indice.min(), indice.max())
+
+    ## Lectura
+
+    def vistas(self, linea, desde=None, hasta=None):
+        """Genera ``(indice, valores)`` por partición dentro de ``[desde, hasta]``.
+
+        ``valores`` es una vista de solo lectura del archivo mapeado.
+        """
+        meses = self.meses(linea)
+        if not meses:
+            return
+        primero, ultimo = self.rango(linea)
+        inicio = primero if desde is None else max(primero, intervalo_fecha(desde)[0])
+        fin = ultimo if hasta is None else min(ultimo, intervalo_fecha(hasta)[1])
+
+        for mes in meses:
+            if mes.end_time < inicio or mes.start_time > fin:
+                continue
+            particion = np.load(self._ruta(linea, mes), mmap_mode='r')
+            a = max(0, int(np.ceil((inicio - mes.start_time) / self.paso)))
+            b = min(len(particion), int(np.floor((fin - mes.start_time) / self.paso)) + 1)
+            if b > a:
+                yield self._indice(mes, a, b), particion[a:b]
+
+    def leer(self, linea, desde=None, hasta=None):
+        """``pd.Series`` con los valores de ``linea`` entre ``desde`` y ``hasta``.
+
+        Si el rango cae en una sola partición la serie comparte memoria con el
+        archivo mapeado (no hay copia).
+        """
+        partes = list(self.vistas(linea, desde, hasta))
+        if not partes:
+            return pd.Series(dtype=self.dtype, index=pd.DatetimeIndex([]), name=linea)
+        if len(partes) == 1:
+            indice, valores = partes[0]
+            return pd.Series(valores, index=indice, name=linea, copy=False)
+        indice = partes[0][0].append([i for i, _ in partes[1:]])
+        return pd.Series(np.concatenate([v for _, v in partes]), index=indice, name=linea)
+
+    def resample(self, linea, regla, agregacion='sum', desde=None, hasta=None):
+        """Equivale a ``leer(linea, desde, hasta).resample(regla).agg(agregacion)``.
+
+        Se agrega cada partición por separado y se combinan los parciales de
+        los periodos que cruzan el límite de mes (por ejemplo, semanas).
+        """
+        if agregacion not in AGREGACIONES:
+            raise ValueError(f"Agregación no soportada: {agregacion!r}")
+        parciales = []
+        for indice, valores in self.vistas(linea, desde, hasta):
+            serie = pd.Series(valores, index=indice, copy=False).astype(np.float64)
+            grupos = serie.resample(regla)
+            if agregacion == 'mean':
+                parciales.append(pd.DataFrame({'sum': grupos.sum(), 'count': grupos.count()}))
+            else:
+                parciales.append(grupos.agg(agregacion).to_frame(agregacion))
+        if not parciales:
+            return pd.Series(dtype=np.float64, name=linea)
+
+        combinar = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+        total = pd.concat(parciales).groupby(level=0).agg(
+            {columna: combinar[columna] for columna in parciales[0].columns})
+        if agregacion == 'mean':
+            resultado = total['sum'] / total['count'].where(total['count'] > 0)
+        else:
+            resultado = total[agregacion]
+        return resultado.rename(linea)
+
+    def linea(self, nombre):
+        """Acceso estilo pandas a una línea: ``almacen.linea('l1')['2024-01']``."""
+        return LineaHoraria(self, nombre)
+
+
+class LineaHoraria:
+    """Vista de una línea del almacén que admite la selección de ``ejercicios04.py``."""
+
+    def __init__(self, almacen, nombre):
+        self.almacen = almacen
+        self.nombre = nombre
+
+    def __getitem__(self, clave):
+        if isinstance(clave, slice):
+            return self.almacen.leer(self.nombre, clave.start, clave.stop)
+        return self.almacen.leer(self.nombre, clave, clave)
+
+    def resample(self, regla, agregacion='sum'):
+        return self.almacen.resample(self.nombre, regla, agregacion)
+
+    def agregar(self, serie):
+        self.almacen.agregar(self.nombre, serie)
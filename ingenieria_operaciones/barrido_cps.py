@@ -0,0 +1,64 @@
+"""Barrido paralelo de ``changepoint_prior_scale`` para Prophet.
+
+Equivale al ciclo ``for cps in valores_cps`` de
+``introduccion_prophet/ejercicios02.py``, pero cada valor de la grilla se
+ajusta en un proceso distinto.
+
+Ejemplo::
+
+    from ingenieria_operaciones.barrido_cps import barrido_cps
+
+    modelos = barrido_cps(df_demanda, [0.001, 0.01, 0.1, 0.5], max_workers=4)
+    modelos[0.1].head()   # columnas 'ds' y 'yhat'
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .instrumentacion import etapa
+
+
+def ajustar_cps(df, cps, periodos=30):
+    """Ajusta un modelo Prophet con el ``cps`` indicado y predice ``periodos`` días.
+
+    Devuelve el DataFrame ``forecast[['ds', 'yhat']]`` igual que el ejercicio.
+    """
+    from prophet import Prophet
+
+    m = Prophet(changepoint_prior_scale=cps)
+    with etapa('fit', cps=cps, filas=len(df)):
+        m.fit(df)
+    with etapa('predict', cps=cps, filas=len(df) + periodos):
+        future = m.make_future_dataframe(periods=periodos)
+        forecast = m.predict(future)
+    return forecast[['ds', 'yhat']].reset_index(drop=True)
+
+
+def barrido_cps(df, valores_cps, periodos=30, max_workers=None):
+    """Ajusta un modelo por cada valor de ``valores_cps`` en un pool de procesos.
+
+    Parámetros
+    ----------
+    df : DataFrame con columnas ``ds`` y ``y``.
+    valores_cps : valores de ``changepoint_prior_scale`` a evaluar.
+    periodos : horizonte de predicción (días).
+    max_workers : número de procesos. ``None`` usa todos los núcleos y ``1``
+        ejecuta el barrido en el proceso actual, sin pool.
+
+    Devuelve el diccionario ``modelos[cps] -> forecast[['ds', 'yhat']]``. El
+    orden de las llaves es siempre el de ``valores_cps`` y cada ajuste depende
+    solo de ``(df, cps)``, así que el resultado no cambia con la cantidad de
+    procesos.
+    """
+    valores_cps = list(valores_cps)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(valores_cps) or 1))
+
+    if max_workers == 1:
+        return {cps: ajustar_cps(df, cps, periodos) for cps in valores_cps}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futuros = [pool.submit(ajustar_cps, df, cps, periodos) for cps in valores_cps]
+        # Se recorre en el orden de la grilla, no en el orden de finalización
+        return {cps: futuro.result() for cps, futuro in zip(valores_cps, futuros)}
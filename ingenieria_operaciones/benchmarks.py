@@ -0,0 +1,300 @@
+"""Benchmarks de escalabilidad de las etapas de los ejercicios.
+
+Cada etapa se ejecuta con tamaños proporcionales a los de los ejercicios
+(100 días de demanda, 720 horas de producción, 4 productos) multiplicados por
+un factor de escala:
+
+* ``csv_groupby``: ``read_csv`` + ``groupby(['Producto']).agg`` (pandas/ejercicios03.py).
+* ``rolling_resample``: ``rolling(7).mean()`` + ``resample('W'/'ME')`` (pandas/ejercicios04.py).
+* ``prophet_fit_predict``: ``fit`` + ``predict`` del modelo de demanda (introduccion_prophet).
+* ``prophet_lote``: ``pronosticar_lote`` sobre ``SERIES_LOTE`` series por unidad
+  de escala (mil series con ``x100``).
+* ``renderizado``: gráfico de línea guardado a 300 dpi (pandas/ejercicios05.py).
+
+Cada medición corre en un proceso nuevo. La memoria se informa como el
+aumento del RSS pico sobre el RSS justo antes de la parte medida, de modo que
+no incluye el intérprete, las importaciones ni la generación de datos (en Linux
+el pico se reinicia con ``/proc/self/clear_refs``; en otros sistemas el pico
+de la preparación puede ocultar el de la etapa). En ``prophet_lote`` solo se
+cuenta el proceso principal, no los del pool.
+
+Cada combinación se repite ``repeticiones`` veces y se guarda la mediana. Si
+se indica una línea base, se marcan como regresión las mediciones que
+empeoran por encima de la tolerancia relativa y además de un mínimo absoluto
+(``MINIMO_SEGUNDOS``, ``MINIMO_MB``), para que el ruido de etapas de pocos
+milisegundos no cuente como regresión.
+
+Uso::
+
+    python -m ingenieria_operaciones.benchmarks --escalas 1 10 100 --salida bench.json
+    python -m ingenieria_operaciones.benchmarks --linea-base bench.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+DIAS_DEMANDA = 100
+HORAS_PRODUCCION = 24 * 30
+PRODUCTOS = 4
+SERIES_LOTE = 10
+
+# cambios menores a estos no se consideran regresión aunque superen la tolerancia
+MINIMO_SEGUNDOS = 0.05
+MINIMO_MB = 10
+
+_rss_base = None
+
+
+def _rss_mb():
+    """``(rss_actual, rss_pico)`` del proceso en MB; ``None`` donde no se pueda medir."""
+    try:
+        with open('/proc/self/status', encoding='ascii') as archivo:
+            valores = dict(linea.split(':', 1) for linea in archivo)
+        return int(valores['VmRSS'].split()[0]) / 1024, int(valores['VmHWM'].split()[0]) / 1024
+    except (OSError, KeyError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None, None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB y macOS bytes
+    return None, pico / 1024**2 if sys.platform == 'darwin' else pico / 1024
+
+
+def _comenzar():
+    """Marca el inicio de la parte medida: reinicia el pico de RSS y guarda la base."""
+    global _rss_base
+    try:
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as archivo:
+            archivo.write('5')
+    except OSError:
+        pass
+    actual, pico = _rss_mb()
+    _rss_base = pico if actual is None else actual
+    return time.perf_counter()
+
+
+## Etapas: cada una prepara sus datos, llama a _comenzar() antes del trabajo
+## medido y devuelve (filas, segundos)
+
+def etapa_csv_groupby(escala, rng):
+    filas = HORAS_PRODUCCION * escala
+    productos = np.array([f'Producto {i}' for i in range(PRODUCTOS * escala)])
+    datos = pd.DataFrame({
+        'Fecha': pd.date_range('2024-01-01', periods=filas, freq='h').strftime('%Y-%m-%d'),
+        'Producto': productos[rng.integers(0, len(productos), filas)],
+        'Cantidad': rng.integers(20, 250, filas),
+        'Defectos': rng.integers(0, 5, filas),
+        'Unidad': 'Unidades',
+    })
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'datos_produccion.csv')
+        datos.to_csv(ruta, index=False)
+        del datos
+        inicio = _comenzar()
+        datos_produccion = pd.read_csv(ruta)
+        datos_produccion.groupby(['Producto']).agg(
+            Total_Producido=('Cantidad', 'sum'),
+            Total_Defectos=('Defectos', 'mean'),
+        )
+        return filas, time.perf_counter() - inicio
+
+
+def etapa_rolling_resample(escala, rng):
+    dias = DIAS_DEMANDA * escala
+    demanda = pd.Series(rng.integers(50, 200, size=dias),
+                        index=pd.date_range('2024-01-01', periods=dias, freq='D'))
+    inicio = _comenzar()
+    demanda.rolling(window=7).mean()
+    demanda.resample('W').sum()
+    demanda.resample('ME').sum()
+    return dias, time.perf_counter() - inicio
+
+
+def etapa_prophet_fit_predict(escala, rng):
+    import logging
+    from .generador import generar_demanda
+    from .modelos import CONFIG_DEMANDA, crear_modelo
+
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    df_demanda = generar_demanda(dias=DIAS_DEMANDA * escala, semilla=int(rng.integers(2**32)))[['ds', 'y']]
+    inicio = _comenzar()
+    modelo = crear_modelo(**CONFIG_DEMANDA)
+    modelo.fit(df_demanda)
+    modelo.predict(modelo.make_future_dataframe(periods=30))
+    return len(df_demanda), time.perf_counter() - inicio
+
+
+def etapa_prophet_lote(escala, rng):
+    import logging
+    from .generador import generar_demanda
+    from .pronostico_lote import pronosticar_lote
+
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    df_largo = generar_demanda(SERIES_LOTE * escala, dias=DIAS_DEMANDA, semilla=int(rng.integers(2**32)))
+    inicio = _comenzar()
+    pronosticar_lote(df_largo, columna_serie='serie', reportar=None)
+    return len(df_largo), time.perf_counter() - inicio
+
+
+def etapa_renderizado(escala, rng):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    horas = HORAS_PRODUCCION * escala
+    produccion = pd.Series(rng.normal(50, 5, horas),
+                           index=pd.date_range('2024-01-01', periods=horas, freq='h'))
+    with tempfile.TemporaryDirectory() as directorio:
+        inicio = _comenzar()
+        fig = plt.figure(figsize=(12, 6))
+        produccion.plot(kind='line', color='green', linewidth=2)
+        plt.tight_layout()
+        fig.savefig(os.path.join(directorio, 'produccion.png'), dpi=300)
+        plt.close(fig)
+        return horas, time.perf_counter() - inicio
+
+
+ETAPAS = {
+    'csv_groupby': etapa_csv_groupby,
+    'rolling_resample': etapa_rolling_resample,
+    'prophet_fit_predict': etapa_prophet_fit_predict,
+    'prophet_lote': etapa_prophet_lote,
+    'renderizado': etapa_renderizado,
+}
+
+
+def _medir(nombre, escala, semilla):
+    rng = np.random.default_rng(semilla)
+    filas, segundos = ETAPAS[nombre](escala, rng)
+    _, pico = _rss_mb()
+    return {
+        'etapa': nombre,
+        'escala': escala,
+        'filas': filas,
+        'segundos': segundos,
+        'rss_delta_mb': max(pico - _rss_base, 0.0) if pico is not None and _rss_base is not None else None,
+    }
+
+
+def _mediana(valores):
+    valores = [v for v in valores if v is not None]
+    return float(np.median(valores)) if valores else None
+
+
+def ejecutar(etapas=None, escalas=(1, 10, 100), repeticiones=3, semilla=1405, reportar=print):
+    """Mide cada combinación de etapa y escala y devuelve el informe como diccionario.
+
+    Se guarda la mediana de ``repeticiones`` mediciones, cada una en un proceso nuevo.
+    """
+    contexto = multiprocessing.get_context('spawn')
+    resultados = []
+    for nombre in etapas or ETAPAS:
+        for escala in escalas:
+            mediciones = []
+            for _ in range(repeticiones):
+                with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as pool:
+                    mediciones.append(pool.submit(_medir, nombre, escala, semilla).result())
+            filas = mediciones[0]['filas']
+            segundos = _mediana(m['segundos'] for m in mediciones)
+            resultado = {
+                'etapa': nombre,
+                'escala': escala,
+                'filas': filas,
+                'repeticiones': repeticiones,
+                'segundos': segundos,
+                'filas_por_s': filas / segundos if segundos > 0 else None,
+                'rss_delta_mb': _mediana(m['rss_delta_mb'] for m in mediciones),
+            }
+            resultados.append(resultado)
+            if reportar is not None:
+                reportar(f"{nombre:<20} x{escala:<5} {filas:>10,} filas "
+                         f"{segundos:8.3f} s  {resultado['rss_delta_mb'] or 0:8.1f} MB")
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'resultados': resultados,
+    }
+
+
+def comparar(informe, linea_base, tolerancia=0.2, minimo_segundos=MINIMO_SEGUNDOS, minimo_mb=MINIMO_MB):
+    """Lista las mediciones de ``informe`` que empeoran respecto a ``linea_base``.
+
+    Una medición es regresión si su tiempo o su aumento de RSS superan los de
+    la base (misma etapa y escala) en más de ``tolerancia`` (fracción) y en más
+    de ``minimo_segundos`` o ``minimo_mb`` en términos absolutos.
+    """
+    minimos = {'segundos': minimo_segundos, 'rss_delta_mb': minimo_mb}
+    base = {(r['etapa'], r['escala']): r for r in linea_base['resultados']}
+    regresiones = []
+    for actual in informe['resultados']:
+        anterior = base.get((actual['etapa'], actual['escala']))
+        if anterior is None:
+            continue
+        for metrica, minimo in minimos.items():
+            if actual.get(metrica) is None or not anterior.get(metrica):
+                continue
+            cambio = actual[metrica] / anterior[metrica] - 1
+            if cambio > tolerancia and actual[metrica] - anterior[metrica] > minimo:
+                regresiones.append({
+                    'etapa': actual['etapa'],
+                    'escala': actual['escala'],
+                    'metrica': metrica,
+                    'base': anterior[metrica],
+                    'actual': actual[metrica],
+                    'cambio': cambio,
+                })
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--etapas', nargs='+', choices=list(ETAPAS), help='etapas a medir (todas por defecto)')
+    parser.add_argument('--escalas', nargs='+', type=int, default=[1, 10, 100])
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--salida', help='archivo JSON donde guardar el informe')
+    parser.add_argument('--linea-base', help='informe JSON previo contra el cual comparar')
+    parser.add_argument('--tolerancia', type=float, default=0.2)
+    parser.add_argument('--minimo-segundos', type=float, default=MINIMO_SEGUNDOS)
+    parser.add_argument('--minimo-mb', type=float, default=MINIMO_MB)
+    args = parser.parse_args(argv)
+
+    # la base se lee antes de medir: --salida puede ser el mismo archivo
+    linea_base = None
+    if args.linea_base:
+        with open(args.linea_base, 'r', encoding='utf-8') as archivo:
+            linea_base = json.load(archivo)
+
+    informe = ejecutar(args.etapas, args.escalas, args.repeticiones)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(informe, archivo, indent=2)
+        print(f"✓ Informe guardado como '{args.salida}'")
+
+    if linea_base is not None:
+        regresiones = comparar(informe, linea_base, args.tolerancia, args.minimo_segundos, args.minimo_mb)
+        for r in regresiones:
+            print(f"✗ Regresión en {r['etapa']} x{r['escala']}: {r['metrica']} "
+                  f"{r['base']:.3f} -> {r['actual']:.3f} (+{r['cambio']:.0%})")
+        if regresiones:
+            return 1
+        print("✓ Sin regresiones respecto a la línea base")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Búsqueda de hiperparámetros por reducción sucesiva (*successive halving*).
+
+Reemplaza el ciclo exhaustivo ``for cps in valores_cps`` de
+``introduccion_prophet/ejercicios02.py``. En la primera ronda todas las
+configuraciones se evalúan con pocos cortes de validación cruzada (los más
+recientes); en cada ronda se conserva la mejor fracción ``1/eta`` y se
+multiplica por ``eta`` la cantidad de cortes. Solo las configuraciones
+ganadoras reciben el ajuste con la historia completa y la predicción de 30 días.
+
+Ejemplo::
+
+    configs = grilla(changepoint_prior_scale=[0.001, 0.01, 0.1, 0.5],
+                     seasonality_prior_scale=[0.1, 1.0, 10.0],
+                     seasonality_mode=['additive', 'multiplicative'])
+    modelos, registro = reduccion_sucesiva(df_demanda, configs, n_ganadores=2)
+"""
+
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .modelos import CONFIG_DEMANDA
+from .validacion_cruzada import evaluar_corte, generar_cortes
+
+
+def grilla(**valores):
+    """Lista de configuraciones con todas las combinaciones de ``valores``."""
+    nombres = list(valores)
+    return [dict(zip(nombres, combinacion)) for combinacion in itertools.product(*valores.values())]
+
+
+def _llave(config, variables):
+    if len(variables) == 1:
+        return config[variables[0]]
+    return tuple(config[v] for v in variables)
+
+
+def _evaluar(df, corte, horizonte, config, directorio_cache):
+    cv = evaluar_corte(df, corte, horizonte, config, directorio_cache)
+    return (cv['y'] - cv['yhat']).abs().mean()
+
+
+def _ajustar_completo(df, config, periodos):
+    from .modelos import crear_modelo
+
+    modelo = crear_modelo(**config)
+    modelo.fit(df)
+    futuro = modelo.make_future_dataframe(periods=periodos)
+    return modelo.predict(futuro)[['ds', 'yhat']]
+
+
+def reduccion_sucesiva(df, configs, base=None, horizonte='14 days', periodo='7 days',
+                       inicial='28 days', eta=3, pliegues_iniciales=1, n_ganadores=1,
+                       periodos=30, max_workers=None, directorio_cache='.cache_modelos'):
+    """Busca las mejores configuraciones de ``configs`` para la serie ``df``.
+
+    Parámetros
+    ----------
+    configs : lista de diccionarios con los argumentos que varían.
+    base : argumentos fijos de ``Prophet`` (por defecto ``CONFIG_DEMANDA``).
+    eta : factor de reducción por ronda.
+    pliegues_iniciales : cortes usados en la primera ronda.
+    n_ganadores : configuraciones que reciben el ajuste completo.
+
+    Devuelve ``(modelos, registro)``. ``modelos`` tiene la misma forma que en
+    el ejercicio (``forecast[['ds', 'yhat']]``) para las ganadoras, con llave el
+    valor del parámetro que varía (o la tupla de valores si varían varios).
+    ``registro`` es un DataFrame con el MAE de cada configuración en cada ronda.
+    """
+    base = CONFIG_DEMANDA if base is None else base
+    variables = [v for v in configs[0] if len({str(c[v]) for c in configs}) > 1] or list(configs[0])
+    df = df[['ds', 'y']].sort_values('ds').reset_index(drop=True)
+    cortes = generar_cortes(df, horizonte, periodo, inicial)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    vivos = list(range(len(configs)))
+    pliegues = min(pliegues_iniciales, len(cortes))
+    registro = []
+    ronda = 0
+    pool = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+    try:
+        while True:
+            seleccion = cortes[-pliegues:]
+            tareas = [(i, corte) for i in vivos for corte in seleccion]
+            args = [(df, corte, horizonte, {**base, **configs[i]}, directorio_cache) for i, corte in tareas]
+            if pool is None:
+                errores = [_evaluar(*a) for a in args]
+            else:
+                errores = list(pool.map(_evaluar, *zip(*args)))
+
+            mae = pd.Series(errores, index=[i for i, _ in tareas]).groupby(level=0).mean()
+            ultima = len(vivos) <= n_ganadores or pliegues == len(cortes)
+            conservar = n_ganadores if ultima else max(n_ganadores, math.ceil(len(vivos) / eta))
+            ordenados = mae.sort_values(kind='stable').index.tolist()
+            for i in vivos:
+                registro.append({'ronda': ronda, **configs[i], 'pliegues': pliegues,
+                                 'mae': mae[i], 'sobrevive': i in ordenados[:conservar]})
+            vivos = ordenados[:conservar]
+            if ultima:
+                break
+            ronda += 1
+            pliegues = min(pliegues * eta, len(cortes))
+
+        args = [(df, {**base, **configs[i]}, periodos) for i in vivos]
+        if pool is None:
+            pronosticos = [_ajustar_completo(*a) for a in args]
+        else:
+            pronosticos = list(pool.map(_ajustar_completo, *zip(*args)))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    modelos = {_llave(configs[i], variables): pronostico for i, pronostico in zip(vivos, pronosticos)}
+    return modelos, pd.DataFrame(registro)
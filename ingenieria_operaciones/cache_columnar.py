@@ -0,0 +1,122 @@
+"""Caché columnar (Feather/Arrow) de los CSV de producción.
+
+La primera vez que se lee ``datos_produccion.csv`` se convierte a un archivo
+Feather sin compresión con tipos optimizados:
+
+* ``Producto`` y ``Unidad`` como ``category``.
+* ``Fecha`` como ``datetime64``.
+* ``Cantidad`` y ``Defectos`` reducidos al entero más pequeño que los contiene.
+
+Las lecturas siguientes abren el Feather con ``memory_map=True`` en lugar de
+volver a interpretar el texto. Junto al caché se guarda un ``.json`` con la
+fecha de modificación, el tamaño y el hash SHA-256 del CSV; si cambian, el
+caché se reconstruye.
+
+Requiere ``pyarrow``. Si no está instalado se lee el CSV directamente con los
+mismos tipos, sin caché.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from .instrumentacion import etapa
+
+COLUMNAS_CATEGORICAS = ['Producto', 'Unidad']
+COLUMNAS_FECHA = ['Fecha']
+COLUMNAS_ENTERAS = ['Cantidad', 'Defectos']
+
+
+def leer_csv_optimizado(ruta_csv):
+    """Lee ``ruta_csv`` aplicando los tipos compactos descritos arriba."""
+    with etapa('lectura_csv', ruta=str(ruta_csv)) as e:
+        df = pd.read_csv(ruta_csv, parse_dates=COLUMNAS_FECHA)
+        e.filas(len(df))
+    for columna in COLUMNAS_CATEGORICAS:
+        if columna in df:
+            df[columna] = df[columna].astype('category')
+    for columna in COLUMNAS_ENTERAS:
+        if columna in df:
+            df[columna] = pd.to_numeric(df[columna], downcast='integer')
+    return df
+
+
+def hash_archivo(ruta, tam_bloque=1024**2):
+    """SHA-256 del contenido de ``ruta`` leído por bloques."""
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(tam_bloque), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def rutas_cache(ruta_csv, directorio_cache=None):
+    """Rutas del archivo Feather y de sus metadatos para ``ruta_csv``."""
+    directorio = directorio_cache or os.path.dirname(os.path.abspath(ruta_csv))
+    base = os.path.splitext(os.path.basename(ruta_csv))[0]
+    ruta_feather = os.path.join(directorio, f'.{base}.feather')
+    return ruta_feather, f'{ruta_feather}.json'
+
+
+def _firma(ruta_csv):
+    info = os.stat(ruta_csv)
+    return {'mtime_ns': info.st_mtime_ns, 'tamano': info.st_size}
+
+
+def cache_vigente(ruta_csv, directorio_cache=None):
+    """Indica si el caché de ``ruta_csv`` existe y corresponde al CSV actual.
+
+    Si solo cambió la fecha de modificación pero el hash es el mismo, se
+    actualizan los metadatos y el caché se considera vigente.
+    """
+    ruta_feather, ruta_meta = rutas_cache(ruta_csv, directorio_cache)
+    if not (os.path.exists(ruta_feather) and os.path.exists(ruta_meta)):
+        return False
+    with open(ruta_meta, 'r', encoding='utf-8') as archivo:
+        meta = json.load(archivo)
+
+    firma = _firma(ruta_csv)
+    if firma['mtime_ns'] == meta.get('mtime_ns') and firma['tamano'] == meta.get('tamano'):
+        return True
+    if firma['tamano'] != meta.get('tamano') or hash_archivo(ruta_csv) != meta.get('sha256'):
+        return False
+
+    meta.update(firma)
+    with open(ruta_meta, 'w', encoding='utf-8') as archivo:
+        json.dump(meta, archivo)
+    return True
+
+
+def construir_cache(ruta_csv, directorio_cache=None):
+    """Convierte ``ruta_csv`` a Feather y devuelve el DataFrame optimizado."""
+    from pyarrow import feather
+
+    ruta_feather, ruta_meta = rutas_cache(ruta_csv, directorio_cache)
+    firma = _firma(ruta_csv)
+    df = leer_csv_optimizado(ruta_csv)
+
+    temporal = f'{ruta_feather}.{os.getpid()}.tmp'
+    feather.write_feather(df, temporal, compression='uncompressed')
+    os.replace(temporal, ruta_feather)
+    with open(ruta_meta, 'w', encoding='utf-8') as archivo:
+        json.dump({**firma, 'sha256': hash_archivo(ruta_csv)}, archivo)
+    return df
+
+
+def cargar_produccion(ruta_csv='./pandas/datos_produccion.csv', directorio_cache=None):
+    """Carga ``ruta_csv`` desde el caché columnar, creándolo si hace falta."""
+    try:
+        from pyarrow import feather
+    except ImportError:
+        return leer_csv_optimizado(ruta_csv)
+
+    if not cache_vigente(ruta_csv, directorio_cache):
+        return construir_cache(ruta_csv, directorio_cache)
+
+    ruta_feather, _ = rutas_cache(ruta_csv, directorio_cache)
+    with etapa('lectura_cache', ruta=ruta_feather) as e:
+        tabla = feather.read_table(ruta_feather, memory_map=True)
+        e.filas(tabla.num_rows)
+        return tabla.to_pandas(split_blocks=True)
@@ -0,0 +1,119 @@
+"""Caché en disco de modelos Prophet ya entrenados.
+
+La llave de cada modelo es un hash del contenido de los datos de entrenamiento
+(columnas ``ds`` y ``y``) más los argumentos del constructor. Si la llave ya
+existe se carga el modelo guardado y no se llama a ``fit``.
+
+Ejemplo::
+
+    from ingenieria_operaciones.cache_modelos import CacheModelos
+    from ingenieria_operaciones.modelos import CONFIG_DEMANDA
+
+    cache = CacheModelos('.cache_modelos', max_bytes=200 * 1024**2)
+    modelo_demanda = cache.obtener_o_ajustar(df_demanda, **CONFIG_DEMANDA)
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .modelos import crear_modelo
+
+
+def clave_modelo(df, **config):
+    """Calcula la llave del caché para ``df[['ds', 'y']]`` y ``config``."""
+    h = hashlib.sha256()
+    ds = df['ds'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    y = df['y'].to_numpy(dtype=np.float64)
+    h.update(np.ascontiguousarray(ds).tobytes())
+    h.update(np.ascontiguousarray(y).tobytes())
+    h.update(json.dumps(config, sort_keys=True, default=str).encode('utf-8'))
+    return h.hexdigest()
+
+
+class CacheModelos:
+    """Directorio de modelos serializados con desalojo LRU por tamaño.
+
+    Cada modelo se guarda como ``<llave>.json`` con ``prophet.serialize``. La
+    fecha de modificación del archivo se actualiza en cada acierto y, cuando el
+    directorio supera ``max_bytes``, se eliminan primero los modelos usados
+    hace más tiempo.
+    """
+
+    def __init__(self, directorio='.cache_modelos', max_bytes=512 * 1024**2):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        os.makedirs(directorio, exist_ok=True)
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, f'{clave}.json')
+
+    def cargar(self, clave):
+        """Devuelve el modelo guardado con ``clave`` o ``None`` si no existe."""
+        from prophet.serialize import model_from_json
+
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'r', encoding='utf-8') as archivo:
+                modelo = model_from_json(archivo.read())
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(ruta)  # marca el modelo como usado recientemente
+        except FileNotFoundError:
+            pass  # otro proceso lo desalojó después de leerlo
+        return modelo
+
+    def guardar(self, clave, modelo):
+        """Guarda ``modelo`` bajo ``clave`` y aplica el límite de tamaño."""
+        from prophet.serialize import model_to_json
+
+        ruta = self._ruta(clave)
+        temporal = f'{ruta}.{os.getpid()}.tmp'
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            archivo.write(model_to_json(modelo))
+        os.replace(temporal, ruta)  # escritura atómica
+        self.desalojar()
+
+    def obtener_o_ajustar(self, df, **config):
+        """Devuelve un modelo entrenado sobre ``df``, desde el caché si es posible."""
+        clave = clave_modelo(df, **config)
+        modelo = self.cargar(clave)
+        if modelo is not None:
+            self.aciertos += 1
+            return modelo
+        self.fallos += 1
+        modelo = crear_modelo(**config)
+        modelo.fit(df)
+        self.guardar(clave, modelo)
+        return modelo
+
+    def tamano(self):
+        """Tamaño total en bytes de los modelos guardados."""
+        return sum(tam for _, tam, _ in self._entradas())
+
+    def desalojar(self):
+        """Elimina los modelos menos usados hasta quedar dentro de ``max_bytes``."""
+        entradas = sorted(self._entradas(), key=lambda e: e[2])
+        total = sum(tam for _, tam, _ in entradas)
+        for ruta, tam, _ in entradas:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                pass
+            total -= tam
+
+    def _entradas(self):
+        entradas = []
+        with os.scandir(self.directorio) as it:
+            for entrada in it:
+                if entrada.name.endswith('.json') and entrada.is_file():
+                    info = entrada.stat()
+                    entradas.append((entrada.path, info.st_size, info.st_mtime_ns))
+        return entradas
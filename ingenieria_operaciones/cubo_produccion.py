@@ -0,0 +1,194 @@
+"""Cubo de agregados hora → día → semana → mes por línea de producción.
+
+``pandas/ejercicios04.py`` calcula las vistas semanal (``resample('W').sum()``)
+y mensual (``resample('ME')``) cada vez que se piden, recorriendo todas las
+horas. :class:`CuboProduccion` las materializa: para cada línea guarda, por
+nivel, una tabla con ``sum``, ``count``, ``min`` y ``max`` de cada periodo,
+etiquetada igual que ``resample``:
+
+* ``'dia'`` (``'D'``): inicio del día;
+* ``'semana'`` (``'W'``): domingo que cierra la semana;
+* ``'mes'`` (``'ME'``): último día del mes.
+
+Los días se resumen desde las horas y las semanas y los meses desde los días.
+Al llegar horas nuevas (o corregidas) solo se recalculan los días, semanas y
+meses que las contienen. Las consultas leen el nivel pedido, sin volver a las
+horas.
+
+Con ``directorio`` las horas se guardan en un :class:`AlmacenHorario` y cada
+nivel en un ``.npz`` por línea; sin él, todo vive en memoria.
+
+Ejemplo::
+
+    cubo = CuboProduccion('cubo_produccion')
+    cubo.agregar('linea_1', df_produccion.set_index('ds')['y'])
+    cubo.consultar('linea_1', 'semana')            # == resample('W').sum()
+    cubo.consultar('linea_1', 'mes', 'mean')       # == resample('ME').mean()
+    cubo.tabla('mes', desde='2024', hasta='2025')  # una columna por línea
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from .almacen_horario import AGREGACIONES, AlmacenHorario
+
+NIVELES = {'hora': 'h', 'dia': 'D', 'semana': 'W', 'mes': 'ME'}
+COLUMNAS = ['sum', 'count', 'min', 'max']
+COMBINAR = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+
+
+def etiquetas(fechas, nivel):
+    """Etiqueta del periodo de ``nivel`` al que pertenece cada fecha (como ``resample``)."""
+    fechas = pd.DatetimeIndex(fechas)
+    if nivel == 'dia':
+        return fechas.floor('D')
+    periodo = 'W' if nivel == 'semana' else 'M'
+    return fechas.to_period(periodo).end_time.normalize().as_unit(fechas.unit)
+
+
+def _nivel(nivel):
+    for nombre, regla in NIVELES.items():
+        if nivel in (nombre, regla):
+            return nombre
+    raise ValueError(f"Nivel no soportado: {nivel!r}; use uno de {list(NIVELES)}")
+
+
+def _resumir(valores, claves):
+    """``sum``, ``count``, ``min`` y ``max`` de ``valores`` agrupados por ``claves``."""
+    return pd.Series(valores).groupby(claves).agg(COLUMNAS)
+
+
+class CuboProduccion:
+    """Agregados materializados por línea y nivel, con actualización incremental."""
+
+    def __init__(self, directorio=None, paso='h'):
+        self.directorio = directorio
+        self.almacen = None if directorio is None else AlmacenHorario(os.path.join(directorio, 'horas'), paso)
+        self._horas = {}
+        self._tablas = {}
+
+    ## Persistencia
+
+    def _ruta(self, linea, nivel):
+        return os.path.join(self.directorio, 'niveles', linea, f'{nivel}.npz')
+
+    def _tabla(self, linea, nivel):
+        clave = (linea, nivel)
+        if clave not in self._tablas:
+            tabla = pd.DataFrame({c: pd.Series(dtype=np.float64) for c in COLUMNAS},
+                                 index=pd.DatetimeIndex([]))
+            if self.directorio is not None and os.path.exists(self._ruta(linea, nivel)):
+                with np.load(self._ruta(linea, nivel)) as datos:
+                    tabla = pd.DataFrame({c: datos[c] for c in COLUMNAS},
+                                         index=pd.DatetimeIndex(datos['indice']))
+            self._tablas[clave] = tabla
+        return self._tablas[clave]
+
+    def _guardar(self, linea, nivel, tabla):
+        self._tablas[(linea, nivel)] = tabla
+        if self.directorio is None:
+            return
+        ruta = self._ruta(linea, nivel)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        temporal = ruta + '.tmp.npz'
+        np.savez(temporal, indice=tabla.index.to_numpy(), **{c: tabla[c].to_numpy() for c in COLUMNAS})
+        os.replace(temporal, ruta)
+
+    def lineas(self):
+        """Nombres de las líneas con datos."""
+        if self.almacen is not None:
+            return self.almacen.lineas()
+        return sorted(self._horas)
+
+    ## Horas
+
+    def horas(self, linea, desde=None, hasta=None):
+        """Serie horaria de ``linea`` (el nivel base del cubo)."""
+        if self.almacen is not None:
+            return self.almacen.leer(linea, desde, hasta).astype(np.float64)
+        serie = self._horas.get(linea, pd.Series(dtype=np.float64, index=pd.DatetimeIndex([])))
+        return serie.loc[desde:hasta].rename(linea)
+
+    def _escribir_horas(self, linea, serie):
+        if self.almacen is not None:
+            self.almacen.agregar(linea, serie)
+            return
+        anterior = self._horas.get(linea)
+        if anterior is not None:
+            serie = pd.concat([anterior[~anterior.index.isin(serie.index)], serie]).sort_index()
+        self._horas[linea] = serie
+
+    ## Actualización
+
+    def agregar(self, linea, serie):
+        """Escribe horas nuevas o corregidas de ``linea`` y refresca sus periodos.
+
+        Devuelve cuántos periodos se recalcularon en cada nivel.
+        """
+        serie = serie.astype(np.float64).sort_index()
+        serie = serie[~serie.index.duplicated(keep='last')]
+        if serie.empty:
+            return {}
+        self._escribir_horas(linea, serie)
+
+        # días afectados: se vuelven a resumir con todas sus horas
+        dias = etiquetas(serie.index, 'dia').unique()
+        horas = self.horas(linea, dias.min(), dias.max() + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns'))
+        horas = horas[etiquetas(horas.index, 'dia').isin(dias)]
+        nuevos = {'dia': _resumir(horas.to_numpy(), etiquetas(horas.index, 'dia'))}
+        self._reemplazar(linea, 'dia', nuevos['dia'])
+
+        # semanas y meses afectados: se combinan desde sus días
+        dia = self._tabla(linea, 'dia')
+        for nivel in ('semana', 'mes'):
+            afectados = etiquetas(dias, nivel).unique()
+            claves = etiquetas(dia.index, nivel)
+            seleccion = claves.isin(afectados)
+            nuevos[nivel] = dia[seleccion].groupby(claves[seleccion]).agg(COMBINAR)
+            self._reemplazar(linea, nivel, nuevos[nivel])
+        return {nivel: len(tabla) for nivel, tabla in nuevos.items()}
+
+    def _reemplazar(self, linea, nivel, nuevos):
+        tabla = self._tabla(linea, nivel)
+        tabla = pd.concat([tabla[~tabla.index.isin(nuevos.index)], nuevos.astype(np.float64)])
+        self._guardar(linea, nivel, tabla.sort_index())
+
+    ## Consultas
+
+    def resumen(self, linea, nivel, desde=None, hasta=None):
+        """Tabla ``sum``/``count``/``min``/``max`` de ``nivel`` con los periodos vacíos incluidos.
+
+        ``desde`` y ``hasta`` filtran por la etiqueta del periodo.
+        """
+        nivel = _nivel(nivel)
+        if nivel == 'hora':
+            horas = self.horas(linea, desde, hasta)
+            return pd.DataFrame({'sum': horas.fillna(0.0), 'count': horas.notna().astype(np.float64),
+                                 'min': horas, 'max': horas})
+        tabla = self._tabla(linea, nivel)
+        if tabla.empty:
+            return tabla
+        completo = pd.date_range(tabla.index[0], tabla.index[-1], freq=NIVELES[nivel], unit=tabla.index.unit)
+        tabla = tabla.reindex(completo)
+        tabla[['sum', 'count']] = tabla[['sum', 'count']].fillna(0.0)
+        return tabla.loc[desde:hasta]
+
+    def consultar(self, linea, nivel, agregacion='sum', desde=None, hasta=None):
+        """Equivale a ``horas.resample(NIVELES[nivel]).agg(agregacion)`` leyendo el nivel precalculado."""
+        if agregacion not in AGREGACIONES:
+            raise ValueError(f"Agregación no soportada: {agregacion!r}")
+        tabla = self.resumen(linea, nivel, desde, hasta)
+        if agregacion == 'mean':
+            resultado = tabla['sum'] / tabla['count'].where(tabla['count'] > 0)
+        elif agregacion == 'count':
+            resultado = tabla['count'].astype(np.int64)
+        else:
+            resultado = tabla[agregacion]
+        return resultado.rename(linea)
+
+    def tabla(self, nivel, agregacion='sum', desde=None, hasta=None, lineas=None):
+        """``consultar`` para varias líneas, una columna por línea."""
+        lineas = self.lineas() if lineas is None else lineas
+        return pd.concat({l: self.consultar(l, nivel, agregacion, desde, hasta) for l in lineas}, axis=1)
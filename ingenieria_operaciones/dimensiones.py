@@ -0,0 +1,170 @@
+"""Índices de tablas de dimensión para enriquecer lotes de hechos sin ``pd.merge``.
+
+``pandas/ejercicios02.py`` une tablas con ``pd.merge(izquierda, derecha,
+on='clave')`` y ``df2`` relaciona cada ``Material`` con su ``Proveedor`` y
+``Costo_Kg``. Cada ``merge`` vuelve a construir la tabla hash de las claves y a
+buscar en ella cada fila de hechos. :class:`IndiceDimension` factoriza la
+dimensión una sola vez y guarda, por clave, dónde empiezan sus filas y cuántas
+son. Enriquecer un lote es entonces:
+
+1. convertir la clave de los hechos a códigos de la dimensión: si la columna
+   es categórica basta con traducir sus categorías (pocas) y indexar con los
+   códigos, sin tocar texto fila por fila; si no, se factoriza el lote y solo
+   sus valores distintos se buscan en el índice de claves;
+2. tomar las columnas de la dimensión con ``take`` sobre esas posiciones.
+
+El resultado es el mismo que ``pd.merge(hechos, dimension, on=clave, how=...)``
+para ``how='inner'`` y ``how='left'``, incluidas las claves repetidas en la
+dimensión (como ``'Acero'`` en ``df2``), que multiplican las filas igual que
+``merge``, y las claves nulas, que como en ``merge`` se unen entre sí. La única diferencia es que una clave categórica en los hechos sigue
+siendo categórica (``merge`` la convierte a texto si la dimensión no lo es).
+
+Ejemplo::
+
+    materiales = IndiceDimension(df2, 'Material')
+    for lote in pd.read_csv('consumos.csv', chunksize=1_000_000, dtype={'Material': 'category'}):
+        enriquecido = materiales.enriquecer(lote)
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+
+class IndiceDimension:
+    """Tabla de dimensión indexada por ``clave`` para búsquedas vectorizadas."""
+
+    def __init__(self, dimension, clave, columnas=None):
+        self.clave = clave
+        self.columnas = [c for c in (columnas or dimension.columns) if c != clave]
+        self.dimension = dimension.reset_index(drop=True)
+        # la clave nula también recibe un código: merge une nulos con nulos
+        codigos, self.claves = pd.factorize(self.dimension[clave], use_na_sentinel=False)
+        nulas = np.flatnonzero(pd.isna(self.claves))
+        self.codigo_nulo = int(nulas[0]) if len(nulas) else -1
+        # filas de la dimensión agrupadas por clave, en su orden original
+        self.orden = np.argsort(codigos, kind='stable')
+        self.conteos = np.bincount(codigos, minlength=len(self.claves))
+        self.inicios = np.r_[0, np.cumsum(self.conteos)[:-1]]
+        self.unica = bool((self.conteos == 1).all())
+        self._mapas = {}
+
+    def codigos(self, valores):
+        """Código de la dimensión de cada valor (``-1`` si la clave no existe).
+
+        Los nulos toman el código de la clave nula de la dimensión, si la hay.
+        """
+        if isinstance(valores.dtype, pd.CategoricalDtype):
+            categorias = valores.cat.categories
+            # el mapa de categorías se reutiliza entre lotes con las mismas categorías
+            mapa = self._mapas.get(id(categorias))
+            if mapa is None or mapa[0] is not categorias:
+                mapa = (categorias, np.r_[self.claves.get_indexer(categorias), self.codigo_nulo])
+                self._mapas = {id(categorias): mapa}
+            return mapa[1][valores.cat.codes.to_numpy()]
+        # factorizar el lote y buscar solo sus valores distintos es más rápido
+        # que buscar cada fila en la tabla hash de la dimensión
+        codigos, distintos = pd.factorize(valores)
+        return np.r_[self.claves.get_indexer(distintos), self.codigo_nulo][codigos]
+
+    def posiciones(self, codigos, how='inner'):
+        """``(filas_hechos, filas_dimension)`` del resultado, como lo ordena ``merge``.
+
+        Con ``how='left'`` las filas sin clave en la dimensión tienen ``-1``.
+        """
+        if how not in ('inner', 'left'):
+            raise ValueError(f"Tipo de unión no soportado: {how!r}")
+        encontrados = codigos >= 0
+        if self.unica:
+            filas_dimension = np.where(encontrados, self.orden[self.inicios[np.maximum(codigos, 0)]], -1)
+            if how == 'left':
+                return np.arange(len(codigos)), filas_dimension
+            filas_hechos = np.flatnonzero(encontrados)
+            return filas_hechos, filas_dimension[filas_hechos]
+
+        repeticiones = np.where(encontrados, self.conteos[np.maximum(codigos, 0)], 0)
+        if how == 'left':
+            repeticiones = np.maximum(repeticiones, 1)
+        filas_hechos = np.repeat(np.arange(len(codigos)), repeticiones)
+        inicio_bloque = np.repeat(np.cumsum(repeticiones) - repeticiones, repeticiones)
+        desplazamiento = np.arange(len(filas_hechos)) - inicio_bloque
+        codigo = codigos[filas_hechos]
+        filas_dimension = np.where(
+            codigo >= 0, self.orden[self.inicios[np.maximum(codigo, 0)] + desplazamiento], -1)
+        return filas_hechos, filas_dimension
+
+    def enriquecer(self, hechos, clave_hechos=None, how='inner', sufijos=('_x', '_y')):
+        """Equivale a ``pd.merge(hechos, dimension, on=clave, how=how)``.
+
+        ``clave_hechos`` permite que la columna de los hechos tenga otro nombre
+        (como ``left_on``); en ese caso se conserva también la clave de la
+        dimensión.
+        """
+        clave_hechos = clave_hechos or self.clave
+        filas_hechos, filas_dimension = self.posiciones(self.codigos(hechos[clave_hechos]), how)
+
+        resultado = {}
+        repetidas = set(hechos.columns) & set(self.columnas)
+        for columna in hechos.columns:
+            nombre = columna + sufijos[0] if columna in repetidas else columna
+            resultado[nombre] = hechos[columna].array.take(filas_hechos)
+        columnas = self.columnas if clave_hechos == self.clave else [self.clave] + self.columnas
+        for columna in columnas:
+            nombre = columna + sufijos[1] if columna in repetidas else columna
+            resultado[nombre] = self.dimension[columna].array.take(filas_dimension, allow_fill=True)
+        return pd.DataFrame(resultado)
+
+
+## Comparación con pd.merge
+
+def _verificar(resultado, esperado, clave):
+    resultado[clave] = resultado[clave].astype(esperado[clave].dtype)
+    if not resultado.equals(esperado):
+        raise AssertionError("El enriquecimiento indexado no coincide con pd.merge")
+
+
+def verificar_nulos(dimension, clave, n_filas=10_000):
+    """Compara con ``pd.merge`` usando una dimensión con clave nula en la primera fila."""
+    fila_nula = dimension.iloc[:1].copy()
+    fila_nula[clave] = None
+    con_nulo = pd.concat([fila_nula, dimension], ignore_index=True)
+    indice = IndiceDimension(con_nulo, clave)
+    for categorica in (True, False):
+        hechos = hechos_sinteticos(dimension, clave, n_filas, categorica)
+        for how in ('inner', 'left'):
+            _verificar(indice.enriquecer(hechos, how=how), pd.merge(hechos, con_nulo, on=clave, how=how), clave)
+            # sin clave nula en la dimensión los nulos de los hechos no encuentran fila
+            _verificar(IndiceDimension(dimension, clave).enriquecer(hechos, how=how),
+                       pd.merge(hechos, dimension, on=clave, how=how), clave)
+
+
+def hechos_sinteticos(dimension, clave, n_filas=1_000_000, categorica=True, semilla=1405):
+    """Lote de consumos ``clave, Kg`` con claves tomadas de la dimensión (y algunas ausentes o nulas)."""
+    rng = np.random.default_rng(semilla)
+    claves = np.array([*pd.unique(dimension[clave]), 'Titanio', None], dtype=object)
+    valores = claves[rng.integers(0, len(claves), n_filas)]
+    hechos = pd.DataFrame({clave: valores, 'Kg': np.round(rng.uniform(1, 500, n_filas), 1)})
+    if categorica:
+        hechos[clave] = hechos[clave].astype('category')
+    return hechos
+
+
+def comparar(dimension, clave, n_filas=1_000_000, lotes=5, how='left', categorica=True):
+    """Segundos de ``enriquecer`` frente a ``pd.merge`` sobre ``lotes`` lotes de hechos."""
+    hechos = [hechos_sinteticos(dimension, clave, n_filas, categorica, semilla=1405 + i)
+              for i in range(lotes)]
+
+    inicio = time.perf_counter()
+    indice = IndiceDimension(dimension, clave)
+    resultados = [indice.enriquecer(lote, how=how) for lote in hechos]
+    segundos_indice = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    esperados = [pd.merge(lote, dimension, on=clave, how=how) for lote in hechos]
+    segundos_merge = time.perf_counter() - inicio
+
+    for resultado, esperado in zip(resultados, esperados):
+        _verificar(resultado, esperado, clave)
+    return {'indice': segundos_indice, 'merge': segundos_merge,
+            'aceleracion': segundos_merge / segundos_indice}
@@ -0,0 +1,196 @@
+"""Resumen de distribuciones (tiempos de ciclo) por lotes y en memoria acotada.
+
+La sección 4 de ``pandas/ejercicios05.py`` guarda todos los ``tiempos_ciclo``
+en un DataFrame para llamar ``describe()``, dibujar un histograma de 15 barras
+y marcar la media. :class:`ResumenDistribucion` recibe los valores por lotes y
+conserva solo:
+
+* conteo, media y suma de cuadrados centrados (fusión de Chan), mínimo y máximo;
+* un sketch de cuantiles tipo KLL: niveles de compactación donde cada elemento
+  del nivel ``h`` representa ``2**h`` valores;
+* opcionalmente, un histograma de bordes fijos cuando se conoce ``rango``.
+
+Los resúmenes parciales se fusionan con :meth:`ResumenDistribucion.fusionar`,
+por lo que cada proceso puede resumir su parte de los datos. Mientras el
+sketch no ha compactado nada (hasta ``k`` valores) los cuartiles y el
+histograma coinciden exactamente con pandas; después son aproximados con un
+error de rango del orden de ``1/k``.
+
+Ejemplo::
+
+    resumen = ResumenDistribucion()
+    for bloque in pd.read_csv('tiempos.csv', chunksize=1_000_000):
+        resumen.agregar(bloque['Tiempo'])
+    print(resumen.describe())
+    conteos, bordes = resumen.histograma(15)
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .instrumentacion import etapa
+
+
+class ResumenDistribucion:
+    """Estado fusionable con momentos, sketch de cuantiles e histograma fijo.
+
+    ``k`` controla la precisión y la memoria del sketch (del orden de ``3k``
+    valores). Con ``rango=(inferior, superior)`` se lleva además un histograma
+    exacto de ``bins`` barras sobre ese rango.
+    """
+
+    def __init__(self, nombre='Tiempo', k=2000, bins=15, rango=None, semilla=1405):
+        self.nombre = nombre
+        self.k = k
+        self.conteo = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self._niveles = [np.empty(0)]
+        self._rng = np.random.default_rng(semilla)
+        self.bordes = None if rango is None else np.linspace(rango[0], rango[1], bins + 1)
+        self.conteos = None if rango is None else np.zeros(bins, dtype=np.int64)
+        self.fuera_de_rango = 0
+
+    ## Actualización
+
+    def agregar(self, valores):
+        """Incorpora un lote de valores; se ignoran los NaN como en ``describe()``."""
+        x = np.asarray(valores, dtype=np.float64).ravel()
+        x = x[~np.isnan(x)]
+        if len(x) == 0:
+            return self
+        self._fusionar_momentos(len(x), x.mean(), ((x - x.mean()) ** 2).sum(), x.min(), x.max())
+        if self.bordes is not None:
+            conteos, _ = np.histogram(x, bins=self.bordes)
+            self.conteos += conteos
+            self.fuera_de_rango += len(x) - conteos.sum()
+        self._niveles[0] = np.concatenate([self._niveles[0], x])
+        self._compactar()
+        return self
+
+    def fusionar(self, otro):
+        """Incorpora el estado de otro resumen (p. ej. calculado en otro proceso)."""
+        if otro.conteo == 0:
+            return self
+        self._fusionar_momentos(otro.conteo, otro.media, otro.m2, otro.minimo, otro.maximo)
+        if self.bordes is not None:
+            if otro.bordes is None or not np.array_equal(self.bordes, otro.bordes):
+                raise ValueError("Los histogramas a fusionar deben tener los mismos bordes")
+            self.conteos += otro.conteos
+            self.fuera_de_rango += otro.fuera_de_rango
+        for h, nivel in enumerate(otro._niveles):
+            if h == len(self._niveles):
+                self._niveles.append(np.empty(0))
+            self._niveles[h] = np.concatenate([self._niveles[h], nivel])
+        self._compactar()
+        return self
+
+    def _fusionar_momentos(self, n, media, m2, minimo, maximo):
+        total = self.conteo + n
+        delta = media - self.media
+        self.media += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.conteo * n / total
+        self.conteo = total
+        self.minimo = min(self.minimo, minimo)
+        self.maximo = max(self.maximo, maximo)
+
+    def _capacidad(self, nivel):
+        profundidad = len(self._niveles) - 1 - nivel
+        return max(2, math.ceil(self.k * (2 / 3) ** profundidad))
+
+    def _compactar(self):
+        """Compacta cada nivel lleno: ordena y pasa uno de cada dos al siguiente."""
+        h = 0
+        while h < len(self._niveles):
+            nivel = self._niveles[h]
+            if len(nivel) <= self._capacidad(h):
+                h += 1
+                continue
+            if h + 1 == len(self._niveles):
+                self._niveles.append(np.empty(0))
+            nivel = np.sort(nivel)
+            resto, nivel = nivel[:len(nivel) % 2], nivel[len(nivel) % 2:]
+            elegidos = nivel[self._rng.integers(2)::2]
+            self._niveles[h + 1] = np.concatenate([self._niveles[h + 1], elegidos])
+            self._niveles[h] = resto
+            # al crecer la altura cambian las capacidades de los niveles inferiores
+            h = 0
+
+    ## Consultas
+
+    def _muestra_ponderada(self):
+        valores = np.concatenate(self._niveles)
+        pesos = np.concatenate([np.full(len(n), 2 ** h) for h, n in enumerate(self._niveles)])
+        orden = np.argsort(valores, kind='stable')
+        return valores[orden], pesos[orden]
+
+    def cuantiles(self, q):
+        """Cuantiles con interpolación lineal (exactos mientras no haya compactación)."""
+        valores, pesos = self._muestra_ponderada()
+        if len(valores) == 0:
+            return np.full(np.shape(q), np.nan)
+        # posición (base 0) del centro de cada elemento en la muestra completa;
+        # la compactación conserva el peso total, que siempre es ``conteo``
+        centros = np.cumsum(pesos) - pesos / 2 - 0.5
+        centros = np.r_[0, centros, self.conteo - 1]
+        valores = np.r_[self.minimo, valores, self.maximo]
+        return np.interp(np.asarray(q) * (self.conteo - 1), centros, valores)
+
+    def describe(self):
+        """Tabla equivalente a ``DataFrame({nombre: valores}).describe()``."""
+        q25, q50, q75 = self.cuantiles([0.25, 0.5, 0.75])
+        std = math.sqrt(self.m2 / (self.conteo - 1)) if self.conteo > 1 else math.nan
+        media = self.media if self.conteo else math.nan
+        minimo, maximo = (self.minimo, self.maximo) if self.conteo else (math.nan, math.nan)
+        return pd.DataFrame(
+            {self.nombre: [float(self.conteo), media, std, minimo, q25, q50, q75, maximo]},
+            index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+        )
+
+    def histograma(self, bins=15):
+        """``(conteos, bordes)`` de ``bins`` barras entre el mínimo y el máximo.
+
+        Es el mismo reparto que usa ``Series.plot(kind='hist', bins=bins)``. Si se
+        dio ``rango`` al construir el resumen se devuelve el histograma fijo.
+        """
+        if self.bordes is not None:
+            return self.conteos.copy(), self.bordes.copy()
+        valores, pesos = self._muestra_ponderada()
+        return np.histogram(valores, bins=bins, range=(self.minimo, self.maximo), weights=pesos)
+
+    def memoria(self):
+        """Bytes ocupados por el sketch y el histograma."""
+        total = sum(n.nbytes for n in self._niveles)
+        return total + (0 if self.conteos is None else self.conteos.nbytes + self.bordes.nbytes)
+
+
+## Resumen de archivos en paralelo
+
+def resumir_csv(ruta, columna='Tiempo', chunksize=1_000_000, **opciones):
+    """Resume la columna ``columna`` de ``ruta`` leyendo ``chunksize`` filas a la vez."""
+    resumen = ResumenDistribucion(nombre=columna, **opciones)
+    with etapa('resumen_distribucion', ruta=str(ruta)) as e:
+        for bloque in pd.read_csv(ruta, usecols=[columna], chunksize=chunksize):
+            resumen.agregar(bloque[columna])
+        e.filas(resumen.conteo)
+    return resumen
+
+
+def resumir_archivos(rutas, columna='Tiempo', chunksize=1_000_000, max_workers=None, **opciones):
+    """Resume varios CSV (uno por estación o por día) en procesos y fusiona los estados."""
+    resumen = ResumenDistribucion(nombre=columna, **opciones)
+    argumentos = [(ruta, columna, chunksize) for ruta in rutas]
+    if max_workers == 1:
+        for a in argumentos:
+            resumen.fusionar(resumir_csv(*a, **opciones))
+        return resumen
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futuros = [pool.submit(resumir_csv, *a, **opciones) for a in argumentos]
+        for futuro in futuros:
+            resumen.fusionar(futuro.result())
+    return resumen
@@ -0,0 +1,231 @@
+"""Flujo de pronóstico para muchas plantas con etapas concurrentes.
+
+Los scripts ejecutan todo en secuencia: leer o generar datos, ajustar,
+predecir, graficar y guardar. El ajuste de Stan usa CPU mientras que leer CSV y
+escribir PNG/CSV esperan al disco, así que con muchas plantas las etapas se
+pueden solapar. :func:`ejecutar_concurrente` arma una tubería con ``asyncio``:
+
+* ``lectura``: lee el CSV de cada planta en un pool de hilos;
+* ``ajuste``: ajusta y predice en un pool de procesos;
+* ``graficos``: genera los PNG en el pool de procesos, como ``renderizar_lote``;
+* ``escritura``: guarda la predicción en CSV en el pool de hilos.
+
+Entre etapas hay colas ``asyncio.Queue`` acotadas: si una etapa se atrasa, las
+anteriores esperan en vez de acumular datos en memoria. Con las etapas
+solapadas el tiempo total tiende al de la etapa más lenta y no a la suma.
+
+Las figuras van a procesos y no a hilos porque ``pyplot`` no es seguro entre
+hilos.
+
+Con ``IO_TRAZA`` activa, ``lectura_csv`` y ``escritura_csv`` se registran
+desde los hilos del pool; cada hilo anida sus etapas por separado y, si se
+solapan con otras, su pico de memoria sale marcado como no fiable.
+
+:func:`ejecutar_secuencial` hace los mismos pasos planta por planta y sirve de
+referencia: cada predicción fija su propia semilla, por lo que ambos caminos
+producen los mismos resultados.
+
+Ejemplo::
+
+    plantas = preparar_plantas('plantas', n_plantas=8)
+    predicciones, tiempos = ejecutar_concurrente(plantas, 'salidas_plantas')
+"""
+
+import asyncio
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .instrumentacion import etapa
+from .pronostico import COLUMNAS_PREDICCION, MODELOS
+
+Planta = namedtuple('Planta', ['nombre', 'ruta', 'modelo'])
+
+ETAPAS = ('lectura', 'ajuste', 'graficos', 'escritura')
+
+
+def preparar_plantas(directorio, n_plantas=8, horas=24*30, semilla=1405):
+    """Escribe ``<directorio>/planta_XX.csv`` con producción horaria simulada."""
+    from .generador import generar_produccion
+
+    os.makedirs(directorio, exist_ok=True)
+    datos = generar_produccion(n_plantas, horas=horas, semilla=semilla)
+    plantas = []
+    for serie, df in datos.groupby('serie'):
+        planta = Planta(f'planta_{serie:02d}', os.path.join(directorio, f'planta_{serie:02d}.csv'), 'produccion')
+        df[['ds', 'y']].to_csv(planta.ruta, index=False)
+        plantas.append(planta)
+    return plantas
+
+
+## Pasos de cada planta (los mismos en ambos caminos)
+
+def leer(planta):
+    with etapa('lectura_csv', planta=planta.nombre) as e:
+        df = pd.read_csv(planta.ruta, parse_dates=['ds'])
+        e.filas(len(df))
+    return df
+
+
+def ajustar_y_predecir(planta, df, intervalos='completa', semilla=1405):
+    """Ajusta y predice una planta. Devuelve ``(modelo_json, prediccion)``."""
+    from prophet.serialize import model_to_json
+
+    from .pronostico import ajustar, predecir
+
+    modelo = ajustar(planta.modelo, df)
+    # semilla propia: la predicción no depende del orden ni del proceso
+    np.random.seed(semilla)
+    prediccion = predecir(planta.modelo, modelo, intervalos)
+    return model_to_json(modelo), prediccion
+
+
+def figuras(planta, modelo_json, prediccion, directorio_salida):
+    """Figuras de predicción y componentes de una planta (sin renderizar)."""
+    from .renderizado import Figura, grafico_componentes, grafico_prediccion
+
+    titulo, xlabel, ylabel = MODELOS[planta.modelo][3:]
+    return [
+        Figura(os.path.join(directorio_salida, f'prediccion_{planta.nombre}.png'), grafico_prediccion,
+               (modelo_json, prediccion, f'{titulo} - {planta.nombre}', xlabel, ylabel)),
+        Figura(os.path.join(directorio_salida, f'componentes_{planta.nombre}.png'), grafico_componentes,
+               (modelo_json, prediccion)),
+    ]
+
+
+def graficar(planta, modelo_json, prediccion, directorio_salida):
+    from .renderizado import renderizar
+
+    return [renderizar(figura)[0] for figura in figuras(planta, modelo_json, prediccion, directorio_salida)]
+
+
+def escribir(planta, prediccion, directorio_salida):
+    ruta = os.path.join(directorio_salida, f'prediccion_{planta.nombre}.csv')
+    with etapa('escritura_csv', planta=planta.nombre, filas=len(prediccion)):
+        prediccion[COLUMNAS_PREDICCION].to_csv(ruta, index=False)
+    return ruta
+
+
+## Ejecución
+
+def ejecutar_secuencial(plantas, directorio_salida='.', graficos=True, intervalos='completa', semilla=1405):
+    """Ejecuta las plantas una por una. Devuelve ``(predicciones, tiempos)``."""
+    os.makedirs(directorio_salida, exist_ok=True)
+    tiempos = dict.fromkeys(ETAPAS, 0.0)
+    predicciones = {}
+    inicio_total = time.perf_counter()
+    for planta in plantas:
+        inicio = time.perf_counter()
+        df = leer(planta)
+        tiempos['lectura'] += time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        modelo_json, prediccion = ajustar_y_predecir(planta, df, intervalos, semilla)
+        tiempos['ajuste'] += time.perf_counter() - inicio
+
+        if graficos:
+            inicio = time.perf_counter()
+            graficar(planta, modelo_json, prediccion, directorio_salida)
+            tiempos['graficos'] += time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        escribir(planta, prediccion, directorio_salida)
+        tiempos['escritura'] += time.perf_counter() - inicio
+        predicciones[planta.nombre] = prediccion
+    tiempos['total'] = time.perf_counter() - inicio_total
+    return predicciones, tiempos
+
+
+async def _etapa(nombre, entrada, salida, consumidores, procesar, tiempos):
+    """Consume ``entrada`` con ``consumidores`` tareas y pasa cada resultado (una tupla) a ``salida``.
+
+    ``None`` en la cola marca el fin; al terminar todas las tareas se reenvía
+    un ``None`` por cada consumidor de la etapa siguiente.
+    """
+    async def consumidor():
+        while True:
+            elemento = await entrada.get()
+            if elemento is None:
+                return
+            inicio = time.perf_counter()
+            resultado = await procesar(*elemento)
+            tiempos[nombre] += time.perf_counter() - inicio
+            if salida is not None:
+                await salida.put(resultado)
+
+    await asyncio.gather(*(consumidor() for _ in range(consumidores)))
+
+
+async def _tuberia(plantas, directorio_salida, graficos, intervalos, semilla, procesos, hilos, capacidad):
+    from .renderizado import renderizar
+
+    bucle = asyncio.get_running_loop()
+    tiempos = dict.fromkeys(ETAPAS, 0.0)
+    predicciones = {}
+    procesos = procesos or os.cpu_count() or 1
+    colas = {nombre: asyncio.Queue(maxsize=capacidad) for nombre in ETAPAS}
+    consumidores = {'lectura': hilos, 'ajuste': procesos, 'graficos': procesos, 'escritura': hilos}
+
+    with ThreadPoolExecutor(max_workers=hilos) as pool_hilos, \
+            ProcessPoolExecutor(max_workers=procesos) as pool_procesos:
+
+        async def lectura(planta):
+            return planta, await bucle.run_in_executor(pool_hilos, leer, planta)
+
+        async def ajuste(planta, df):
+            modelo_json, prediccion = await bucle.run_in_executor(
+                pool_procesos, ajustar_y_predecir, planta, df, intervalos, semilla)
+            return planta, modelo_json, prediccion
+
+        async def graficar_etapa(planta, modelo_json, prediccion):
+            if graficos:
+                await asyncio.gather(*(bucle.run_in_executor(pool_procesos, renderizar, figura)
+                                       for figura in figuras(planta, modelo_json, prediccion, directorio_salida)))
+            return planta, prediccion
+
+        async def escritura(planta, prediccion):
+            await bucle.run_in_executor(pool_hilos, escribir, planta, prediccion, directorio_salida)
+            predicciones[planta.nombre] = prediccion
+
+        pasos = {'lectura': lectura, 'ajuste': ajuste, 'graficos': graficar_etapa, 'escritura': escritura}
+        siguientes = dict(zip(ETAPAS, ETAPAS[1:] + (None,)))
+
+        async def alimentar():
+            for planta in plantas:
+                await colas['lectura'].put((planta,))
+            for _ in range(consumidores['lectura']):
+                await colas['lectura'].put(None)
+
+        async def correr(nombre):
+            siguiente = siguientes[nombre]
+            salida = colas[siguiente] if siguiente else None
+            await _etapa(nombre, colas[nombre], salida, consumidores[nombre], pasos[nombre], tiempos)
+            if siguiente:
+                for _ in range(consumidores[siguiente]):
+                    await salida.put(None)
+
+        await asyncio.gather(alimentar(), *(correr(nombre) for nombre in ETAPAS))
+
+    # mismo orden que la lista de plantas, como en el camino secuencial
+    return {planta.nombre: predicciones[planta.nombre] for planta in plantas}, tiempos
+
+
+def ejecutar_concurrente(plantas, directorio_salida='.', graficos=True, intervalos='completa', semilla=1405,
+                         procesos=None, hilos=4, capacidad=4):
+    """Ejecuta las plantas con las etapas solapadas. Devuelve ``(predicciones, tiempos)``.
+
+    ``procesos`` son los ajustes y figuras simultáneos, ``hilos`` las lecturas y
+    escrituras simultáneas y ``capacidad`` el tamaño de cada cola entre etapas.
+    En ``tiempos`` cada etapa suma el tiempo que estuvo ocupada y ``total`` es
+    el tiempo de reloj de todo el flujo.
+    """
+    os.makedirs(directorio_salida, exist_ok=True)
+    inicio = time.perf_counter()
+    predicciones, tiempos = asyncio.run(_tuberia(list(plantas), directorio_salida, graficos, intervalos,
+                                                 semilla, procesos, hilos, capacidad))
+    tiempos['total'] = time.perf_counter() - inicio
+    return predicciones, tiempos
@@ -0,0 +1,145 @@
+"""Generador vectorizado de datos industriales simulados.
+
+Reúne los generadores de ``introduccion_prophet`` (tendencia + estacionalidad
+semanal + ruido para la demanda diaria, y ``patron_diario`` + ruido para la
+producción horaria) y los extiende a muchas series y muchos años.
+
+En lugar de la semilla global ``np.random.seed(1405)`` se usa
+``np.random.Generator`` con un ``SeedSequence`` por serie, derivado con
+``spawn`` de la semilla raíz. Cada serie depende solo de la semilla y de su
+número, así que el resultado es idéntico bit a bit sin importar en cuántas
+particiones o procesos se genere.
+
+Ejemplo::
+
+    from ingenieria_operaciones.generador import generar_demanda, escribir_particiones
+
+    df = generar_demanda(n_series=500, dias=3 * 365)          # formato largo serie/ds/y
+    rutas = escribir_particiones('carga', 'demanda', n_series=10_000, dias=10_000,
+                                 particiones=64, max_workers=8)  # 10⁸ filas en disco
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+## Componentes deterministas (iguales a los de los ejercicios)
+
+def componentes_demanda(fechas, tendencia=(100, 150), amplitud=20):
+    """Tendencia lineal más estacionalidad semanal senoidal."""
+    tendencia = np.linspace(tendencia[0], tendencia[1], len(fechas))
+    estacionalidad_semanal = amplitud * np.sin(2 * np.pi * fechas.dayofweek / 7)
+    return tendencia + estacionalidad_semanal
+
+
+def patron_diario(fechas, amplitud=10, nivel=50):
+    """Patrón senoidal de 24 horas alrededor de ``nivel``."""
+    return amplitud * np.sin(2 * np.pi * fechas.hour / 24) + nivel
+
+
+## Generación por series
+
+def semillas(semilla, desde, hasta):
+    """``SeedSequence`` de las series ``desde..hasta-1``.
+
+    Son las mismas hijas que ``SeedSequence(semilla).spawn(hasta)[desde:]``,
+    construidas directamente para no derivar las de otras particiones.
+    """
+    return [np.random.SeedSequence(semilla, spawn_key=(i,)) for i in range(desde, hasta)]
+
+
+def _ruido(semilla, desde, hasta, n, desviacion):
+    ruido = np.empty((hasta - desde, n))
+    for fila, hija in enumerate(semillas(semilla, desde, hasta)):
+        np.random.default_rng(hija).standard_normal(n, out=ruido[fila])
+    ruido *= desviacion
+    return ruido
+
+
+def _formato_largo(base, ruido, fechas, desde):
+    n_series, n = ruido.shape
+    y = np.round(np.asarray(base)[np.newaxis, :] + ruido, 2)
+    return pd.DataFrame({
+        'serie': np.repeat(np.arange(desde, desde + n_series, dtype=np.int32), n),
+        'ds': np.tile(fechas.to_numpy(), n_series),
+        'y': y.ravel(),
+    })
+
+
+def generar_demanda(n_series=1, dias=100, inicio='2024-01-01', semilla=1405,
+                    desde=0, hasta=None, ruido=10):
+    """Demanda diaria de ``n_series`` series en formato largo ``serie, ds, y``.
+
+    ``desde``/``hasta`` seleccionan una partición de series (por defecto todas).
+    """
+    hasta = n_series if hasta is None else hasta
+    fechas = pd.date_range(inicio, periods=dias, freq='D')
+    base = componentes_demanda(fechas)
+    return _formato_largo(base, _ruido(semilla, desde, hasta, dias, ruido), fechas, desde)
+
+
+def generar_produccion(n_series=1, horas=24*30, inicio='2024-01-01 00:00:00', semilla=1405,
+                       desde=0, hasta=None, ruido=5):
+    """Producción horaria de ``n_series`` líneas en formato largo ``serie, ds, y``."""
+    hasta = n_series if hasta is None else hasta
+    fechas = pd.date_range(inicio, periods=horas, freq='h')
+    base = patron_diario(fechas)
+    return _formato_largo(base, _ruido(semilla, desde, hasta, horas, ruido), fechas, desde)
+
+
+GENERADORES = {'demanda': generar_demanda, 'produccion': generar_produccion}
+
+
+def _rangos(n_series, particiones):
+    limites = np.linspace(0, n_series, particiones + 1).astype(int)
+    return [(a, b) for a, b in zip(limites[:-1], limites[1:]) if b > a]
+
+
+def _escribir(ruta, tipo, n_series, kwargs, desde, hasta):
+    df = GENERADORES[tipo](n_series, desde=desde, hasta=hasta, **kwargs)
+    if ruta.endswith('.parquet'):
+        df.to_parquet(ruta, index=False)
+    else:
+        df.to_pickle(ruta)
+    return ruta
+
+
+def generar_particionado(tipo, n_series, particiones=None, max_workers=None, **kwargs):
+    """Genera ``n_series`` series de ``tipo`` ('demanda'/'produccion') en paralelo.
+
+    Devuelve un único DataFrame en orden de serie, idéntico al de
+    ``GENERADORES[tipo](n_series, **kwargs)``.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    rangos = _rangos(n_series, particiones or max_workers)
+    funcion = GENERADORES[tipo]
+    if max_workers == 1 or len(rangos) == 1:
+        partes = [funcion(n_series, desde=a, hasta=b, **kwargs) for a, b in rangos]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futuros = [pool.submit(funcion, n_series, desde=a, hasta=b, **kwargs) for a, b in rangos]
+            partes = [futuro.result() for futuro in futuros]
+    return pd.concat(partes, ignore_index=True)
+
+
+def escribir_particiones(directorio, tipo, n_series, particiones, max_workers=None,
+                         formato='parquet', **kwargs):
+    """Genera las series por particiones y escribe cada una en ``directorio``.
+
+    Pensado para conjuntos de prueba de carga que no caben en memoria: cada
+    proceso genera y guarda su partición sin devolver los datos. ``formato`` es
+    ``'parquet'`` (requiere ``pyarrow``) o ``'pickle'``. Devuelve las rutas en
+    orden de serie.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    extension = 'parquet' if formato == 'parquet' else 'pkl'
+    trabajos = [(os.path.join(directorio, f'{tipo}_{i:05d}.{extension}'), tipo, n_series, kwargs, a, b)
+                for i, (a, b) in enumerate(_rangos(n_series, particiones))]
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        return [_escribir(*trabajo) for trabajo in trabajos]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_escribir, *zip(*trabajos)))
@@ -0,0 +1,268 @@
+"""Índice de grupos reutilizable para muchas agregaciones sobre las mismas claves.
+
+``pandas/ejercicios02.py`` y ``pandas/ejercicios03.py`` hacen
+``groupby('Departamento').sum()`` y ``groupby(['Producto']).agg(...)``; cada
+llamada vuelve a factorizar la columna clave. Los reportes hacen decenas de
+agregaciones distintas sobre las mismas claves (``Producto``,
+``Departamento``, ``Proveedor``). :class:`IndiceGrupos` factoriza las claves una
+sola vez y guarda, por fila, el código de su grupo; a partir de ahí:
+
+* ``sum`` y ``count`` son un ``np.bincount`` (con pesos para la suma);
+* ``mean`` es el cociente de los dos;
+* ``min`` y ``max`` son ``np.fmin.reduceat``/``np.fmax.reduceat`` sobre los
+  valores ordenados por grupo (el orden se calcula una vez);
+* los cuantiles interpolan como ``groupby().quantile()``: con grupos grandes se
+  usa ``np.quantile`` sobre el tramo contiguo de cada grupo; con muchos grupos
+  pequeños se ordena la columna una vez por valor y por grupo.
+
+El índice se puede guardar (:meth:`IndiceGrupos.guardar`) y volver a cargar
+para los siguientes reportes sobre los mismos datos. Los grupos salen ordenados
+y sin claves nulas, como ``groupby`` por defecto.
+
+Ejemplo::
+
+    grupos = IndiceGrupos(datos_produccion, ['Producto'])
+    grupos.agg(datos_produccion,
+               Total_Producido=('Cantidad', 'sum'),
+               Total_Defectos=('Defectos', 'mean'))
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+AGREGACIONES = ('sum', 'count', 'mean', 'min', 'max')
+# filas promedio por grupo a partir de las cuales los cuantiles se calculan
+# grupo por grupo con selección en vez de ordenar toda la columna
+POR_GRUPO_SELECCION = 256
+
+
+class IndiceGrupos:
+    """Códigos de grupo por fila y su orden, calculados una sola vez."""
+
+    def __init__(self, df, claves):
+        self.claves = [claves] if isinstance(claves, str) else list(claves)
+        codigos = None
+        for clave in self.claves:
+            codigos_clave, unicos = pd.factorize(df[clave], sort=True)
+            if codigos is None:
+                codigos = codigos_clave.astype(np.int64)
+                continue
+            # se renumera en cada paso para que el código combinado no desborde
+            nulos = (codigos < 0) | (codigos_clave < 0)
+            combinado = codigos[~nulos] * len(unicos) + codigos_clave[~nulos]
+            codigos = np.full(len(codigos), -1, dtype=np.int64)
+            codigos[~nulos] = np.unique(combinado, return_inverse=True)[1]
+        self._preparar(codigos)
+        primeras = self.orden[self.inicios]
+        self.indice = self._indice_resultado({c: df[c].iloc[primeras] for c in self.claves})
+
+    def _preparar(self, codigos, orden=None):
+        self.codigos = codigos
+        validos = codigos >= 0
+        self.n_grupos = int(codigos.max()) + 1 if validos.any() else 0
+        self.conteos = np.bincount(codigos[validos], minlength=self.n_grupos)
+        # filas válidas ordenadas por grupo, para reduceat y cuantiles
+        if orden is None:
+            orden = np.flatnonzero(validos)[np.argsort(codigos[validos], kind='stable')]
+        self.orden = orden
+        self.inicios = np.r_[0, np.cumsum(self.conteos)[:-1]]
+
+    def _indice_resultado(self, valores):
+        if len(self.claves) == 1:
+            return pd.Index(valores[self.claves[0]].to_numpy(), name=self.claves[0])
+        return pd.MultiIndex.from_arrays([valores[c].to_numpy() for c in self.claves], names=self.claves)
+
+    ## Persistencia
+
+    def guardar(self, directorio):
+        """Guarda los códigos y el orden por grupo (``.npy``) y las claves de cada grupo."""
+        os.makedirs(directorio, exist_ok=True)
+        np.save(os.path.join(directorio, 'codigos.npy'), self.codigos)
+        np.save(os.path.join(directorio, 'orden.npy'), self.orden)
+        pd.to_pickle({'claves': self.claves, 'indice': self.indice},
+                     os.path.join(directorio, 'grupos.pkl'))
+
+    @classmethod
+    def cargar(cls, directorio, mmap_mode=None):
+        """Carga un índice guardado con :meth:`guardar` sin volver a ordenar las filas."""
+        meta = pd.read_pickle(os.path.join(directorio, 'grupos.pkl'))
+        indice = cls.__new__(cls)
+        indice.claves = meta['claves']
+        ruta_orden = os.path.join(directorio, 'orden.npy')
+        orden = np.load(ruta_orden, mmap_mode=mmap_mode) if os.path.exists(ruta_orden) else None
+        indice._preparar(np.load(os.path.join(directorio, 'codigos.npy'), mmap_mode=mmap_mode), orden)
+        indice.indice = meta['indice']
+        return indice
+
+    ## Agregaciones
+
+    def _valores(self, columna):
+        valores = np.asarray(columna)
+        if len(valores) != len(self.codigos):
+            raise ValueError(f"La columna tiene {len(valores)} filas y el índice {len(self.codigos)}")
+        return valores
+
+    def _serie(self, valores, nombre):
+        return pd.Series(valores, index=self.indice, name=nombre)
+
+    def count(self, columna):
+        """Valores no nulos por grupo (``groupby().count()``)."""
+        notna = pd.notna(self._valores(columna))
+        validos = self.codigos >= 0
+        return self._serie(np.bincount(self.codigos[validos & notna], minlength=self.n_grupos),
+                           getattr(columna, 'name', None))
+
+    def sum(self, columna):
+        """Suma por grupo ignorando nulos; las columnas enteras conservan el tipo."""
+        valores = self._valores(columna)
+        if np.issubdtype(valores.dtype, np.integer) or valores.dtype == bool:
+            # suma exacta en int64 (con pesos float64 se pierde precisión sobre 2**53)
+            if self.n_grupos == 0:
+                return self._serie(np.empty(0, dtype=np.int64), getattr(columna, 'name', None))
+            suma = np.add.reduceat(valores[self.orden].astype(np.int64), self.inicios)
+            return self._serie(suma, getattr(columna, 'name', None))
+        validos = self.codigos >= 0
+        pesos = np.nan_to_num(valores[validos].astype(np.float64))
+        suma = np.bincount(self.codigos[validos], weights=pesos, minlength=self.n_grupos)
+        return self._serie(suma, getattr(columna, 'name', None))
+
+    def mean(self, columna):
+        """Media por grupo ignorando nulos."""
+        suma = self.sum(columna).to_numpy(dtype=np.float64)
+        conteo = self.count(columna).to_numpy()
+        media = np.divide(suma, conteo, out=np.full(len(suma), np.nan), where=conteo > 0)
+        return self._serie(media, getattr(columna, 'name', None))
+
+    def _extremo(self, columna, funcion):
+        valores = self._valores(columna)
+        if self.n_grupos == 0:
+            return self._serie(np.empty(0, dtype=valores.dtype), getattr(columna, 'name', None))
+        return self._serie(funcion.reduceat(valores[self.orden], self.inicios), getattr(columna, 'name', None))
+
+    def min(self, columna):
+        """Mínimo por grupo ignorando nulos."""
+        return self._extremo(columna, np.fmin)
+
+    def max(self, columna):
+        """Máximo por grupo ignorando nulos."""
+        return self._extremo(columna, np.fmax)
+
+    def quantile(self, columna, q=0.5):
+        """Cuantil por grupo con interpolación lineal (``groupby().quantile(q)``).
+
+        ``q`` puede ser un escalar o una lista; con una lista se devuelve un
+        DataFrame con una columna por cuantil, en el mismo orden y con los
+        repetidos incluidos.
+        """
+        valores = self._valores(columna).astype(np.float64)
+        cuantiles = np.atleast_1d(q)
+        if self.n_grupos and len(self.orden) >= POR_GRUPO_SELECCION * self.n_grupos:
+            matriz = self._cuantiles_por_seleccion(valores, cuantiles)
+        else:
+            matriz = self._cuantiles_por_orden(valores, cuantiles)
+        if np.ndim(q) == 0:
+            return self._serie(matriz[0], getattr(columna, 'name', None))
+        return pd.DataFrame(matriz.T, index=self.indice, columns=pd.Index(cuantiles))
+
+    def _cuantiles_por_seleccion(self, valores, cuantiles):
+        """Grupos grandes: ``np.quantile`` (selección, O(n)) sobre el tramo de cada grupo."""
+        agrupados = valores[self.orden]
+        matriz = np.full((len(cuantiles), self.n_grupos), np.nan)
+        for grupo, (inicio, conteo) in enumerate(zip(self.inicios, self.conteos)):
+            tramo = agrupados[inicio:inicio + conteo]
+            tramo = tramo[~np.isnan(tramo)]
+            if len(tramo):
+                matriz[:, grupo] = np.quantile(tramo, cuantiles)
+        return matriz
+
+    def _cuantiles_por_orden(self, valores, cuantiles):
+        """Muchos grupos pequeños: un solo ordenamiento por valor y por grupo."""
+        filas = np.flatnonzero(~np.isnan(valores) & (self.codigos >= 0))
+        # se ordena por valor y luego, de forma estable, por grupo: con códigos
+        # pequeños el segundo orden es un radix sort y todo es más rápido que lexsort
+        filas = filas[np.argsort(valores[filas])]
+        codigos = self.codigos[filas]
+        if self.n_grupos <= np.iinfo(np.int16).max:
+            codigos = codigos.astype(np.int16)
+        filas = filas[np.argsort(codigos, kind='stable')]
+        ordenados = valores[filas]
+        conteos = np.bincount(self.codigos[filas], minlength=self.n_grupos)
+        inicios = np.r_[0, np.cumsum(conteos)[:-1]]
+        hay = conteos > 0
+
+        matriz = np.empty((len(cuantiles), self.n_grupos))
+        for i, cuantil in enumerate(cuantiles):
+            posicion = inicios + cuantil * np.maximum(conteos - 1, 0)
+            bajo = np.floor(posicion).astype(np.int64)
+            alto = np.ceil(posicion).astype(np.int64)
+            v_bajo = np.where(hay, ordenados[np.minimum(bajo, len(ordenados) - 1)], np.nan)
+            v_alto = np.where(hay, ordenados[np.minimum(alto, len(ordenados) - 1)], np.nan)
+            matriz[i] = v_bajo + (v_alto - v_bajo) * (posicion - bajo)
+        return matriz
+
+    def agg(self, df, **especificacion):
+        """Agregación con nombre como ``groupby().agg(Total=('Cantidad', 'sum'), ...)``.
+
+        Además de :data:`AGREGACIONES` acepta ``('columna', 0.9)`` para un cuantil.
+        """
+        resultado = {}
+        cuantiles = {}
+        for nombre, (columna, funcion) in especificacion.items():
+            if isinstance(funcion, str):
+                if funcion not in AGREGACIONES:
+                    raise ValueError(f"Agregación no soportada: {funcion!r}")
+                resultado[nombre] = getattr(self, funcion)(df[columna])
+            else:
+                cuantiles.setdefault(columna, []).append((nombre, funcion))
+        # los cuantiles de una misma columna comparten el ordenamiento
+        for columna, pedidos in cuantiles.items():
+            valores = self.quantile(df[columna], [q for _, q in pedidos])
+            for (nombre, _), (_, serie) in zip(pedidos, valores.items()):
+                resultado[nombre] = serie
+        return pd.DataFrame({nombre: resultado[nombre] for nombre in especificacion}, index=self.indice)
+
+
+## Comparación con groupby
+
+def datos_sinteticos(n_filas=1_000_000, semilla=1405):
+    """Registros de producción con ``Producto``, ``Departamento`` y ``Proveedor``."""
+    rng = np.random.default_rng(semilla)
+    productos = ['Tornillo M4', 'Tornillo M6', 'Barra de Acero', 'Placa de Aluminio']
+    departamentos = ['Producción', 'Ventas', 'Logística']
+    proveedores = ['A', 'B', 'C', 'D']
+    return pd.DataFrame({
+        'Producto': np.array(productos)[rng.integers(0, len(productos), n_filas)],
+        'Departamento': np.array(departamentos)[rng.integers(0, len(departamentos), n_filas)],
+        'Proveedor': np.array(proveedores)[rng.integers(0, len(proveedores), n_filas)],
+        'Cantidad': rng.integers(10, 500, n_filas),
+        'Defectos': rng.poisson(2, n_filas).astype(np.float64),
+    })
+
+
+def comparar(df, claves, columnas=('Cantidad', 'Defectos'), funciones=('sum', 'mean', 'count', 'min', 'max', 0.5, 0.9)):
+    """Segundos de todas las ``funciones`` sobre ``columnas`` con el índice y con ``groupby``."""
+    inicio = time.perf_counter()
+    indice = IndiceGrupos(df, claves)
+    propios = {}
+    for columna in columnas:
+        for funcion in funciones:
+            propios[columna, funcion] = indice.agg(df, valor=(columna, funcion))['valor']
+    segundos_indice = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    esperados = {}
+    for columna in columnas:
+        for funcion in funciones:
+            grupos = df.groupby(claves)[columna]
+            esperados[columna, funcion] = (grupos.agg(funcion) if isinstance(funcion, str)
+                                           else grupos.quantile(funcion))
+    segundos_groupby = time.perf_counter() - inicio
+
+    for clave, esperado in esperados.items():
+        if not np.allclose(propios[clave].to_numpy(dtype=float), esperado.to_numpy(dtype=float), equal_nan=True):
+            raise AssertionError(f"{clave} no coincide con groupby")
+    return {'indice': segundos_indice, 'groupby': segundos_groupby,
+            'aceleracion': segundos_groupby / segundos_indice}
@@ -0,0 +1,179 @@
+"""Trazas estructuradas de tiempo y memoria por etapa.
+
+Sustituye las líneas ``print("✓ ...")`` de los ejercicios por registros JSON
+(uno por línea) con la duración, el pico de memoria asignada y la cantidad de
+filas de cada etapa. El pico se informa por encima de la memoria que ya estaba
+asignada al entrar a la etapa, de modo que no arrastra la de etapas
+anteriores::
+
+    from ingenieria_operaciones.instrumentacion import etapa
+
+    with etapa('fit', modelo='demanda', filas=len(df_demanda)):
+        modelo_demanda.fit(df_demanda)
+
+    with etapa('lectura_csv') as e:
+        datos = pd.read_csv(ruta)
+        e.filas(len(datos))
+
+La instrumentación está apagada por defecto y en ese caso ``etapa`` devuelve
+siempre el mismo objeto vacío, sin medir nada. Se enciende con la variable de
+entorno ``IO_TRAZA`` (ruta del archivo ``.jsonl`` o ``-`` para ``stderr``) o
+llamando a :func:`activar`; los procesos hijos heredan la variable y escriben
+en el mismo archivo. La memoria se mide con ``tracemalloc``, que solo se
+inicia cuando la traza está activa.
+
+Cada hilo tiene su propia pila de etapas, así que las etapas anidadas se
+resuelven por hilo y cada registro indica el ``hilo`` que lo escribió. El pico
+de ``tracemalloc`` es uno solo para todo el proceso: si una etapa se solapa
+con otra de otro hilo, su pico incluye la memoria de ambas y no se reinicia al
+entrar; esas etapas salen con ``memoria_pico_fiable`` en ``false``.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+VARIABLE_ENTORNO = 'IO_TRAZA'
+
+_destino = None
+_local = threading.local()
+# etapas abiertas en todos los hilos, para detectar solapamientos
+_abiertas = set()
+_bloqueo = threading.Lock()
+
+
+def _pila():
+    """Pila de etapas abiertas en el hilo actual."""
+    pila = getattr(_local, 'pila', None)
+    if pila is None:
+        pila = _local.pila = []
+    return pila
+
+
+class _EtapaNula:
+    """Etapa que no mide nada; se usa cuando la traza está apagada."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def filas(self, n):
+        pass
+
+
+_NULA = _EtapaNula()
+
+
+class _Etapa:
+    __slots__ = ('nombre', 'atributos', '_filas', '_inicio', '_reloj', '_pico', '_base', '_solapada')
+
+    def __init__(self, nombre, filas, atributos):
+        self.nombre = nombre
+        self.atributos = atributos
+        self._filas = filas
+        self._pico = 0
+        self._solapada = False
+
+    def filas(self, n):
+        """Registra la cantidad de filas procesadas en la etapa."""
+        self._filas = n
+
+    def __enter__(self):
+        pila = _pila()
+        with _bloqueo:
+            # tracemalloc guarda un único pico: se acumula el de la etapa externa
+            # antes de reiniciarlo para la interna.
+            if pila:
+                pila[-1]._pico = max(pila[-1]._pico, tracemalloc.get_traced_memory()[1])
+            if len(_abiertas) > len(pila):
+                # hay etapas abiertas en otros hilos: no se les reinicia el pico
+                for abierta in _abiertas:
+                    abierta._solapada = True
+                self._solapada = True
+            else:
+                tracemalloc.reset_peak()
+            self._base = tracemalloc.get_traced_memory()[0]
+            _abiertas.add(self)
+        pila.append(self)
+        self._inicio = time.time()
+        self._reloj = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        duracion = time.perf_counter() - self._reloj
+        pila = _pila()
+        pila.pop()
+        with _bloqueo:
+            _abiertas.discard(self)
+            self._pico = max(self._pico, tracemalloc.get_traced_memory()[1])
+        if pila:
+            pila[-1]._pico = max(pila[-1]._pico, self._pico)
+            pila[-1]._solapada = pila[-1]._solapada or self._solapada
+        registro = {
+            'etapa': self.nombre,
+            'inicio': self._inicio,
+            'duracion_s': round(duracion, 6),
+            'memoria_pico_mb': round(max(self._pico - self._base, 0) / 1024**2, 3),
+            'memoria_pico_fiable': not self._solapada,
+            'filas': self._filas,
+            'pid': os.getpid(),
+            'hilo': threading.current_thread().name,
+            **self.atributos,
+        }
+        if tipo is not None:
+            registro['error'] = f'{tipo.__name__}: {valor}'
+        _escribir(registro)
+        return False
+
+
+def _escribir(registro):
+    linea = json.dumps(registro, ensure_ascii=False, default=str) + '\n'
+    if _destino == '-':
+        sys.stderr.write(linea)
+    else:
+        with open(_destino, 'a', encoding='utf-8') as archivo:
+            archivo.write(linea)
+
+
+def activar(destino):
+    """Enciende la traza hacia ``destino`` (ruta ``.jsonl`` o ``-`` para ``stderr``)."""
+    global _destino
+    _destino = destino
+    os.environ[VARIABLE_ENTORNO] = destino
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def desactivar():
+    """Apaga la traza y detiene ``tracemalloc``."""
+    global _destino
+    _destino = None
+    os.environ.pop(VARIABLE_ENTORNO, None)
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def activa():
+    """Indica si la traza está encendida."""
+    return _destino is not None
+
+
+def etapa(nombre, filas=None, **atributos):
+    """Context manager que mide la etapa ``nombre``.
+
+    ``atributos`` se agregan tal cual al registro (por ejemplo ``modelo='demanda'``).
+    """
+    if _destino is None:
+        return _NULA
+    return _Etapa(nombre, filas, atributos)
+
+
+if os.environ.get(VARIABLE_ENTORNO):
+    activar(os.environ[VARIABLE_ENTORNO])
@@ -0,0 +1,29 @@
+"""Configuración de los modelos Prophet usados en ``introduccion_prophet``.
+
+Los diccionarios reproducen los argumentos de ``modelo_demanda`` y
+``modelo_produccion`` de los ejercicios para que todos los módulos del paquete
+entrenen exactamente el mismo modelo.
+"""
+
+# Modelo de demanda diaria (ejercicios01.py, sección 3.1)
+CONFIG_DEMANDA = {
+    'yearly_seasonality': False,
+    'daily_seasonality': False,
+    'weekly_seasonality': True,
+    'seasonality_mode': 'additive',
+}
+
+# Modelo de producción horaria (ejercicios01.py, sección 3.2)
+CONFIG_PRODUCCION = {
+    'yearly_seasonality': False,
+    'daily_seasonality': True,
+    'weekly_seasonality': True,
+    'seasonality_mode': 'additive',
+}
+
+
+def crear_modelo(**config):
+    """Crea un ``Prophet`` sin entrenar con los argumentos de ``config``."""
+    from prophet import Prophet
+
+    return Prophet(**config)
@@ -0,0 +1,132 @@
+"""Flujo completo de ``introduccion_prophet/ejercicios01.py`` como funciones.
+
+Genera los datos simulados de demanda y producción, entrena ambos modelos,
+predice, grafica y guarda las predicciones en CSV. Cada paso se registra como
+una etapa de :mod:`ingenieria_operaciones.instrumentacion` (``generacion``,
+``fit``, ``predict``, ``plot`` y ``escritura_csv``).
+
+Ejemplo::
+
+    from ingenieria_operaciones.pronostico import ejecutar
+
+    predicciones = ejecutar(directorio_salida='salidas')
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from .generador import componentes_demanda, patron_diario
+from .instrumentacion import etapa
+from .intervalos import predecir as predecir_con_intervalos
+from .modelos import CONFIG_DEMANDA, CONFIG_PRODUCCION, crear_modelo
+
+COLUMNAS_PREDICCION = ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+
+
+def generar_datos(semilla=1405):
+    """Devuelve ``(df_demanda, df_produccion)`` idénticos a los del ejercicio.
+
+    Usa la semilla global ``np.random.seed`` igual que el script para
+    reproducir sus mismos números; para muchas series o muchos años usar
+    :mod:`ingenieria_operaciones.generador`.
+    """
+    np.random.seed(semilla)
+
+    fechas_demanda = pd.date_range('2024-01-01', periods=100, freq='D')
+    ruido = np.random.normal(0, 10, 100)
+    demanda = np.round(componentes_demanda(fechas_demanda) + ruido, 2)
+    df_demanda = pd.DataFrame({'ds': fechas_demanda, 'y': demanda})
+
+    fechas_produccion = pd.date_range('2024-01-01 00:00:00', periods=24*30, freq='h')
+    ruido_horario = np.random.normal(0, 5, 24*30)
+    produccion = np.round(patron_diario(fechas_produccion) + ruido_horario, 2)
+    df_produccion = pd.DataFrame({'ds': fechas_produccion, 'y': produccion})
+
+    return df_demanda, df_produccion
+
+
+# nombre -> (configuración, periodos, freq, título, eje x, eje y)
+MODELOS = {
+    'demanda': (CONFIG_DEMANDA, 30, 'D', 'Predicción de Demanda Diaria - 30 Días',
+                'Fecha', 'Unidades Demandadas'),
+    'produccion': (CONFIG_PRODUCCION, 48, 'h', 'Predicción de Producción Horaria - 48 Horas',
+                   'Fecha y Hora', 'Unidades Producidas'),
+}
+
+
+def ajustar(nombre, df, cache=None):
+    """Entrena el modelo ``nombre`` ('demanda' o 'produccion') sobre ``df``.
+
+    Si se pasa una :class:`~ingenieria_operaciones.cache_modelos.CacheModelos`
+    el modelo se toma de ella cuando ya fue entrenado con los mismos datos.
+    """
+    config = MODELOS[nombre][0]
+    with etapa('fit', modelo=nombre, filas=len(df)):
+        if cache is not None:
+            return cache.obtener_o_ajustar(df, **config)
+        modelo = crear_modelo(**config)
+        modelo.fit(df)
+        return modelo
+
+
+def predecir(nombre, modelo, intervalos='completa'):
+    """Predice el horizonte del ejercicio para el modelo ``nombre``.
+
+    ``intervalos`` es una de las estrategias de
+    :mod:`ingenieria_operaciones.intervalos`.
+    """
+    _, periodos, freq = MODELOS[nombre][:3]
+    with etapa('predict', modelo=nombre, intervalos=intervalos) as e:
+        futuro = modelo.make_future_dataframe(periods=periodos, freq=freq)
+        prediccion = predecir_con_intervalos(modelo, futuro, intervalos)
+        e.filas(len(prediccion))
+    return prediccion
+
+
+def graficar(modelos, predicciones, directorio_salida='.', max_workers=None):
+    """Genera ``prediccion_*.png`` y ``componentes_*.png`` sin abrir ventanas."""
+    from prophet.serialize import model_to_json
+
+    from .renderizado import Figura, grafico_componentes, grafico_prediccion, renderizar_lote
+
+    figuras = []
+    for nombre, modelo in modelos.items():
+        titulo, xlabel, ylabel = MODELOS[nombre][3:]
+        modelo_json = model_to_json(modelo)
+        prediccion = predicciones[nombre]
+        figuras.append(Figura(os.path.join(directorio_salida, f'prediccion_{nombre}.png'),
+                              grafico_prediccion, (modelo_json, prediccion, titulo, xlabel, ylabel)))
+        figuras.append(Figura(os.path.join(directorio_salida, f'componentes_{nombre}.png'),
+                              grafico_componentes, (modelo_json, prediccion)))
+    with etapa('plot', figuras=len(figuras)):
+        return renderizar_lote(figuras, max_workers=max_workers, reportar=None)
+
+
+def guardar_predicciones(predicciones, directorio_salida='.'):
+    """Escribe ``prediccion_<nombre>.csv`` con ``ds``, ``yhat`` e intervalos."""
+    rutas = []
+    for nombre, prediccion in predicciones.items():
+        ruta = os.path.join(directorio_salida, f'prediccion_{nombre}.csv')
+        with etapa('escritura_csv', modelo=nombre, filas=len(prediccion)):
+            prediccion[COLUMNAS_PREDICCION].to_csv(ruta, index=False)
+        rutas.append(ruta)
+    return rutas
+
+
+def ejecutar(directorio_salida='.', semilla=1405, graficos=True, cache=None, max_workers=None,
+             intervalos='completa'):
+    """Ejecuta el flujo completo y devuelve el diccionario de predicciones."""
+    os.makedirs(directorio_salida, exist_ok=True)
+    with etapa('generacion', filas=100 + 24*30):
+        df_demanda, df_produccion = generar_datos(semilla)
+
+    datos = {'demanda': df_demanda, 'produccion': df_produccion}
+    modelos = {nombre: ajustar(nombre, df, cache) for nombre, df in datos.items()}
+    predicciones = {nombre: predecir(nombre, modelo, intervalos) for nombre, modelo in modelos.items()}
+
+    if graficos:
+        graficar(modelos, predicciones, directorio_salida, max_workers)
+    guardar_predicciones(predicciones, directorio_salida)
+    return predicciones
@@ -0,0 +1,129 @@
+"""Pronóstico en lote de muchas series (por ejemplo, una por ``Producto``).
+
+Aplica a cada serie la misma configuración del modelo de demanda de
+``introduccion_prophet/ejercicios01.py`` (estacionalidad semanal, modo aditivo,
+horizonte de 30 días). Las series se reparten en bloques entre procesos; si una
+serie falla, el error se registra y las demás continúan.
+
+Ejemplo::
+
+    from ingenieria_operaciones.pronostico_lote import pronosticar_lote, serie_larga_produccion
+
+    datos = pd.read_csv('./pandas/datos_produccion.csv')
+    pronostico, errores = pronosticar_lote(serie_larga_produccion(datos))
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from .instrumentacion import etapa
+from .modelos import CONFIG_DEMANDA, crear_modelo
+
+COLUMNAS_PRONOSTICO = ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+
+
+def serie_larga_produccion(datos_produccion, columna_valor='Cantidad'):
+    """Convierte ``datos_produccion.csv`` al formato largo ``Producto, ds, y``.
+
+    Si un producto tiene varios registros el mismo día se suman.
+    """
+    df = pd.DataFrame({
+        'Producto': datos_produccion['Producto'],
+        'ds': pd.to_datetime(datos_produccion['Fecha']),
+        'y': datos_produccion[columna_valor],
+    })
+    return df.groupby(['Producto', 'ds'], as_index=False, observed=True)['y'].sum()
+
+
+def pronosticar_serie(df, periodos=30, freq='D', config=None, semilla=1405, id_serie=None):
+    """Ajusta y predice una sola serie ``ds``/``y``.
+
+    La semilla se fija antes de ``predict`` para que los intervalos
+    ``yhat_lower``/``yhat_upper`` sean reproducibles.
+    """
+    modelo = crear_modelo(**(CONFIG_DEMANDA if config is None else config))
+    with etapa('fit', serie=id_serie, filas=len(df)):
+        modelo.fit(df[['ds', 'y']])
+    with etapa('predict', serie=id_serie, filas=len(df) + periodos):
+        futuro = modelo.make_future_dataframe(periods=periodos, freq=freq)
+        np.random.seed(semilla)
+        return modelo.predict(futuro)[COLUMNAS_PRONOSTICO]
+
+
+def _pronosticar_bloque(series, periodos, freq, config, semilla):
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    resultados = []
+    for id_serie, df in series:
+        try:
+            resultados.append((id_serie, pronosticar_serie(df, periodos, freq, config, semilla, id_serie), None))
+        except Exception as error:  # aislar la falla de una serie
+            resultados.append((id_serie, None, f'{type(error).__name__}: {error}'))
+    return resultados
+
+
+def pronosticar_lote(df_largo, columna_serie='Producto', periodos=30, freq='D',
+                     config=None, max_workers=None, series_por_tarea=8,
+                     semilla=1405, reportar=print):
+    """Pronostica cada serie de ``df_largo`` en un pool de procesos.
+
+    Parámetros
+    ----------
+    df_largo : DataFrame con las columnas ``columna_serie``, ``ds`` e ``y``.
+    columna_serie : columna que identifica cada serie.
+    periodos, freq : horizonte de ``make_future_dataframe``.
+    config : argumentos de ``Prophet``; por defecto ``CONFIG_DEMANDA``.
+    max_workers : número de procesos (``1`` ejecuta en el proceso actual).
+    series_por_tarea : series que se envían juntas a cada proceso.
+    reportar : recibe el avance (series terminadas y series/s); ``None`` lo omite.
+
+    Devuelve ``(pronostico, errores)``: un DataFrame concatenado con
+    ``columna_serie``, ``ds``, ``yhat``, ``yhat_lower`` y ``yhat_upper`` en el
+    orden de las series, y un diccionario ``id -> mensaje`` con las que fallaron.
+    """
+    series = [(id_serie, grupo) for id_serie, grupo
+              in df_largo.groupby(columna_serie, sort=True, observed=True)]
+    bloques = [series[i:i + series_por_tarea] for i in range(0, len(series), series_por_tarea)]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(bloques) or 1))
+
+    resultados = {}
+    inicio = time.perf_counter()
+
+    def registrar(bloque_resultados):
+        for id_serie, pronostico, error in bloque_resultados:
+            resultados[id_serie] = (pronostico, error)
+        if reportar is not None:
+            segundos = time.perf_counter() - inicio
+            reportar(f"{len(resultados)}/{len(series)} series "
+                     f"({len(resultados) / max(segundos, 1e-9):.1f} series/s)")
+
+    args = (periodos, freq, config, semilla)
+    if max_workers == 1:
+        for bloque in bloques:
+            registrar(_pronosticar_bloque(bloque, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futuros = [pool.submit(_pronosticar_bloque, bloque, *args) for bloque in bloques]
+            for futuro in as_completed(futuros):
+                registrar(futuro.result())
+
+    partes = []
+    errores = {}
+    for id_serie, _ in series:
+        pronostico, error = resultados[id_serie]
+        if error is not None:
+            errores[id_serie] = error
+        else:
+            partes.append(pronostico.assign(**{columna_serie: id_serie}))
+
+    if partes:
+        pronostico = pd.concat(partes, ignore_index=True)
+    else:
+        pronostico = pd.DataFrame(columns=COLUMNAS_PRONOSTICO + [columna_serie])
+    return pronostico[[columna_serie] + COLUMNAS_PRONOSTICO], errores
@@ -0,0 +1,194 @@
+"""Análisis vectorizado de ofertas de proveedores a escala de catálogo.
+
+``pandas/ejercicios01.py`` (``proveedores``) y ``pandas/ejercicios05.py``
+(``datos_costos``) comparan tres o cuatro proveedores por costo y tiempo de
+entrega. Con cientos de miles de ofertas proveedor × material, las operaciones
+fila a fila de pandas son demasiado lentas. :class:`IndiceProveedores` ordena
+el catálogo una sola vez por ``(material, costo, tiempo)`` y guarda los límites
+de cada material; a partir de ahí todo se resuelve con operaciones de NumPy
+sobre segmentos:
+
+* frontera de Pareto costo/tiempo de entrega por material;
+* ranking ponderado con costo y tiempo normalizados dentro de cada material;
+* los ``k`` mejores por material.
+
+Ejemplo::
+
+    indice = IndiceProveedores(catalogo, costo='Costo_Unidad')
+    indice.frontera_pareto()
+    indice.top_k(3, peso_costo=0.7, peso_tiempo=0.3)
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+
+class IndiceProveedores:
+    """Catálogo ordenado por material con límites de segmento precalculados.
+
+    ``costo`` admite ``'Costo_Unidad'`` (ejercicios01) o ``'Costo_Promedio'``
+    (ejercicios05). Si el catálogo no tiene columna ``material`` se trata como
+    un único material.
+    """
+
+    def __init__(self, catalogo, costo='Costo_Unidad', tiempo='Tiempo_Entrega', material='Material'):
+        self.catalogo = catalogo
+        if material in catalogo:
+            codigos, self.materiales = pd.factorize(catalogo[material], sort=True)
+        else:
+            codigos, self.materiales = np.zeros(len(catalogo), dtype=np.int64), pd.Index(['(todos)'])
+        c = catalogo[costo].to_numpy(dtype=np.float64)
+        t = catalogo[tiempo].to_numpy(dtype=np.float64)
+
+        self.orden = np.lexsort((t, c, codigos))
+        self.grupo = codigos[self.orden]
+        self.costo = c[self.orden]
+        self.tiempo = t[self.orden]
+        # inicio de cada material dentro del arreglo ordenado
+        self.inicios = np.flatnonzero(np.r_[True, self.grupo[1:] != self.grupo[:-1]])
+        self.tamanos = np.diff(np.r_[self.inicios, len(self.grupo)])
+
+    def _por_fila(self, valores_por_grupo):
+        return np.repeat(valores_por_grupo, self.tamanos)
+
+    def _filas(self, mascara_ordenada):
+        """Filas del catálogo original que cumplen la máscara (en orden de índice)."""
+        return self.catalogo.iloc[np.sort(self.orden[mascara_ordenada])]
+
+    def mascara_pareto(self):
+        """Máscara (en el orden interno) de las ofertas no dominadas de cada material.
+
+        Con las ofertas ordenadas por costo y luego tiempo, una oferta está en
+        la frontera si su tiempo es menor que el mínimo de todas las anteriores
+        de su material. El mínimo acumulado por segmento se obtiene con un solo
+        ``np.minimum.accumulate`` desplazando cada material por debajo del
+        anterior.
+        """
+        n = len(self.tiempo)
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+        rango = self.tiempo.max() - self.tiempo.min() + 1
+        desplazado = self.tiempo - self.grupo * rango
+        minimo_previo = np.r_[np.inf, np.minimum.accumulate(desplazado)[:-1]]
+        minimo_previo[self.inicios] = np.inf
+        es_frontera = desplazado < minimo_previo
+
+        # ofertas repetidas (mismo costo y tiempo) heredan el resultado de la primera
+        nueva = np.r_[True, (self.grupo[1:] != self.grupo[:-1])
+                      | (self.costo[1:] != self.costo[:-1])
+                      | (self.tiempo[1:] != self.tiempo[:-1])]
+        primera = np.maximum.accumulate(np.where(nueva, np.arange(n), 0))
+        return es_frontera[primera]
+
+    def frontera_pareto(self):
+        """Ofertas del catálogo que están en la frontera costo/tiempo de su material."""
+        return self._filas(self.mascara_pareto())
+
+    def puntajes(self, peso_costo=0.5, peso_tiempo=0.5):
+        """Puntaje ponderado (menor es mejor) en el orden interno.
+
+        Costo y tiempo se normalizan a [0, 1] dentro de cada material con
+        ``np.minimum.reduceat``/``np.maximum.reduceat``.
+        """
+        def normalizar(x):
+            minimo = self._por_fila(np.minimum.reduceat(x, self.inicios))
+            maximo = self._por_fila(np.maximum.reduceat(x, self.inicios))
+            rango = maximo - minimo
+            return np.divide(x - minimo, rango, out=np.zeros_like(x), where=rango > 0)
+
+        return peso_costo * normalizar(self.costo) + peso_tiempo * normalizar(self.tiempo)
+
+    def ranking(self, peso_costo=0.5, peso_tiempo=0.5):
+        """Catálogo con ``Puntaje`` y ``Ranking`` (1 = mejor) dentro de cada material."""
+        puntaje = self.puntajes(peso_costo, peso_tiempo)
+        orden = np.lexsort((self.tiempo, self.costo, puntaje, self.grupo))
+        ranking = np.empty(len(orden), dtype=np.int64)
+        ranking[orden] = np.arange(len(orden)) - self._por_fila(self.inicios) + 1
+
+        resultado = self.catalogo.iloc[self.orden].copy()
+        resultado['Puntaje'] = puntaje
+        resultado['Ranking'] = ranking
+        return resultado.sort_index()
+
+    def top_k(self, k, peso_costo=0.5, peso_tiempo=0.5):
+        """Las ``k`` mejores ofertas de cada material según el ranking ponderado."""
+        resultado = self.ranking(peso_costo, peso_tiempo)
+        return resultado[resultado['Ranking'] <= k]
+
+
+## Implementación ingenua (para comparar) y catálogo de prueba
+
+def frontera_pareto_ingenua(catalogo, costo='Costo_Unidad', tiempo='Tiempo_Entrega', material='Material'):
+    """Frontera de Pareto comparando cada oferta contra las de su material."""
+    def frontera(grupo):
+        dominada = []
+        for _, fila in grupo.iterrows():
+            mejores = grupo[(grupo[costo] <= fila[costo]) & (grupo[tiempo] <= fila[tiempo])
+                            & ((grupo[costo] < fila[costo]) | (grupo[tiempo] < fila[tiempo]))]
+            dominada.append(len(mejores) > 0)
+        return grupo[~np.array(dominada, dtype=bool)]
+
+    return catalogo.groupby(material, group_keys=False).apply(frontera).sort_index()
+
+
+def ranking_ingenuo(catalogo, peso_costo=0.5, peso_tiempo=0.5, costo='Costo_Unidad',
+                    tiempo='Tiempo_Entrega', material='Material'):
+    """Ranking ponderado con ``groupby().transform`` y ``sort_values`` por cada consulta."""
+    def normalizar(x):
+        rango = x.max() - x.min()
+        return (x - x.min()) / rango if rango > 0 else x * 0.0
+
+    resultado = catalogo.copy()
+    grupos = resultado.groupby(material)
+    resultado['Puntaje'] = (peso_costo * grupos[costo].transform(normalizar)
+                            + peso_tiempo * grupos[tiempo].transform(normalizar))
+    resultado['Ranking'] = (resultado.sort_values(['Puntaje', costo, tiempo])
+                            .groupby(material).cumcount() + 1)
+    return resultado
+
+
+def catalogo_sintetico(n_materiales=1000, ofertas_por_material=100, semilla=1405):
+    """Catálogo aleatorio ``Material, Proveedor, Costo_Unidad, Tiempo_Entrega``."""
+    rng = np.random.default_rng(semilla)
+    n = n_materiales * ofertas_por_material
+    materiales = np.repeat(np.arange(n_materiales), ofertas_por_material)
+    base = rng.uniform(5, 50, n_materiales)[materiales]
+    return pd.DataFrame({
+        'Material': pd.Categorical(np.char.add('M', materiales.astype(str))),
+        'Proveedor': np.char.add('Proveedor ', rng.integers(0, 5000, n).astype(str)),
+        'Costo_Unidad': np.round(base * rng.uniform(0.8, 1.3, n), 2),
+        'Tiempo_Entrega': rng.integers(1, 30, n),
+    })
+
+
+def comparar(n_materiales=200, ofertas_por_material=50, semilla=1405):
+    """Tiempos de la versión vectorizada frente a la ingenua sobre un catálogo sintético."""
+    catalogo = catalogo_sintetico(n_materiales, ofertas_por_material, semilla)
+    tiempos = {}
+
+    inicio = time.perf_counter()
+    indice = IndiceProveedores(catalogo)
+    tiempos['indice'] = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    frontera = indice.frontera_pareto()
+    tiempos['pareto_vectorizado'] = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    ranking = indice.ranking()
+    tiempos['ranking_vectorizado'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    frontera_ingenua = frontera_pareto_ingenua(catalogo)
+    tiempos['pareto_ingenuo'] = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    ranking_base = ranking_ingenuo(catalogo)
+    tiempos['ranking_ingenuo'] = time.perf_counter() - inicio
+
+    if not frontera.index.equals(frontera_ingenua.index):
+        raise AssertionError("La frontera vectorizada no coincide con la ingenua")
+    if not np.allclose(ranking['Puntaje'], ranking_base['Puntaje']):
+        raise AssertionError("El puntaje vectorizado no coincide con el ingenuo")
+    if not np.array_equal(ranking['Ranking'].to_numpy(), ranking_base['Ranking'].to_numpy()):
+        raise AssertionError("El ranking vectorizado no coincide con el ingenuo")
+    return tiempos
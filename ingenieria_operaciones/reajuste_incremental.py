@@ -0,0 +1,152 @@
+"""Reajuste incremental de modelos Prophet partiendo del ajuste anterior.
+
+Cuando llega otro día de demanda u otra hora de producción, ``Prophet(...).fit(df)``
+vuelve a optimizar desde los valores iniciales por defecto (pendiente e
+intercepto de los extremos, ``delta`` y ``beta`` en cero). :func:`reajustar`
+construye un modelo con la misma configuración (``prophet_copy``) y lo ajusta
+con ``init`` igual a los parámetros del modelo anterior (``k``, ``m``,
+``delta``, ``beta``, ``sigma_obs``) llevados a la nueva escala:
+
+* ``y_scale`` cambia si llega un valor mayor y ``t_scale`` crece con la historia;
+* los changepoints se vuelven a ubicar, así que ``delta`` se obtiene de la
+  pendiente del modelo anterior en cada nuevo changepoint.
+
+Antes de ajustar se revisa la deriva: si los puntos nuevos se alejan del
+pronóstico anterior más de ``umbral_deriva`` desviaciones ``sigma_obs`` en
+promedio, se hace un ajuste en frío. También se cae al ajuste en frío si la
+optimización tibia falla, agota las iteraciones o termina con un ``sigma_obs``
+mucho mayor que el anterior.
+
+Ejemplo::
+
+    modelo, informe = reajustar(modelo_anterior, df_con_horas_nuevas, comparar=True)
+    informe['modo'], informe['iteraciones'], informe['ahorro_segundos']
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from .intervalos import predecir
+
+MAX_ITERACIONES = 10_000
+
+
+def _escala(modelo):
+    """``(y_scale, t_scale, start)`` de un modelo ya preprocesado o ajustado."""
+    return modelo.y_scale, modelo.t_scale, modelo.start
+
+
+def _pendiente_real(modelo, fechas):
+    """Pendiente de la tendencia del modelo (unidades de ``y`` por segundo) en ``fechas``."""
+    y_scale, t_scale, start = _escala(modelo)
+    t = ((pd.DatetimeIndex(fechas) - start) / t_scale).to_numpy(dtype=float)
+    k = float(modelo.params['k'][0, 0])
+    delta = np.ravel(modelo.params['delta'][0])
+    cambios = np.asarray(modelo.changepoints_t, dtype=float)
+    activos = t[:, np.newaxis] >= cambios[np.newaxis, :]
+    return (k + activos @ delta) * y_scale / t_scale.total_seconds()
+
+
+def parametros_iniciales(anterior, nuevo):
+    """Parámetros de ``anterior`` expresados en la escala de ``nuevo`` (ya preprocesado)."""
+    y0, _, _ = _escala(anterior)
+    y1, t1, start1 = _escala(nuevo)
+    razon = y0 / y1
+    segundos = t1.total_seconds()
+
+    # intercepto: tendencia anterior en el nuevo inicio
+    t_inicio = np.array([(start1 - anterior.start) / anterior.t_scale])
+    tendencia = anterior.piecewise_linear(
+        t_inicio, np.ravel(anterior.params['delta'][0]), float(anterior.params['k'][0, 0]),
+        float(anterior.params['m'][0, 0]), np.asarray(anterior.changepoints_t, dtype=float))
+    m = float(tendencia[0]) * razon
+
+    # pendiente inicial y saltos en los nuevos changepoints
+    cambios = start1 + np.asarray(nuevo.changepoints_t, dtype=float) * nuevo.t_scale
+    pendientes = _pendiente_real(anterior, pd.DatetimeIndex([start1]).append(pd.DatetimeIndex(cambios)))
+    pendientes = pendientes * segundos / y1
+    k = float(pendientes[0])
+    delta = np.diff(pendientes)
+
+    # las componentes aditivas están en unidades de y; las multiplicativas no
+    beta = np.ravel(anterior.params['beta'][0])
+    aditivas = nuevo.train_component_cols['additive_terms'].to_numpy(dtype=float)
+    if len(aditivas) == len(beta):
+        beta = beta * np.where(aditivas > 0, razon, 1.0)
+
+    return {
+        'k': k,
+        'm': m,
+        'delta': delta,
+        'beta': beta,
+        'sigma_obs': float(anterior.params['sigma_obs'][0, 0]) * razon,
+    }
+
+
+def deriva(anterior, df):
+    """Error absoluto medio del modelo anterior sobre las filas nuevas de ``df``, en ``sigma_obs``."""
+    nuevos = df[df['ds'] > anterior.history['ds'].max()]
+    if nuevos.empty:
+        return 0.0
+    prediccion = predecir(anterior, nuevos[['ds']], estrategia='puntual')
+    sigma = float(anterior.params['sigma_obs'][0, 0]) * anterior.y_scale
+    error = np.abs(nuevos['y'].to_numpy() - prediccion['yhat'].to_numpy())
+    return float(np.nanmean(error) / sigma)
+
+
+def _ajustar(modelo, df, **kwargs):
+    """Ajusta ``modelo`` y devuelve ``(segundos, iteraciones)``."""
+    inicio = time.perf_counter()
+    modelo.fit(df, save_iterations=True, **kwargs)
+    segundos = time.perf_counter() - inicio
+    iteraciones = len(modelo.stan_fit.optimized_iterations_np) if modelo.stan_fit is not None else 0
+    return segundos, iteraciones
+
+
+def reajustar(anterior, df, umbral_deriva=3.0, tolerancia_sigma=0.5, comparar=False, **kwargs):
+    """Ajusta un modelo nuevo sobre ``df`` partiendo de ``anterior``.
+
+    Devuelve ``(modelo, informe)``. ``informe`` trae ``modo`` (``'tibio'`` o
+    ``'frio'``), ``motivo`` si se cayó al ajuste en frío, ``deriva``,
+    ``segundos`` e ``iteraciones``. Con ``comparar=True`` además ajusta en frío
+    para informar ``segundos_frio``, ``iteraciones_frio`` y el ahorro.
+    """
+    from prophet.diagnostics import prophet_copy
+
+    informe = {'modo': 'tibio', 'motivo': None, 'deriva': deriva(anterior, df)}
+    modelo = None
+    if anterior.growth != 'linear' or anterior.scaling != 'absmax' or anterior.mcmc_samples:
+        informe['motivo'] = 'configuracion'
+    elif informe['deriva'] > umbral_deriva:
+        informe['motivo'] = 'deriva'
+    else:
+        # un modelo descartable solo para conocer la nueva escala y changepoints
+        referencia = prophet_copy(anterior)
+        referencia.preprocess(df)
+        init = parametros_iniciales(anterior, referencia)
+
+        modelo = prophet_copy(anterior)
+        try:
+            informe['segundos'], informe['iteraciones'] = _ajustar(modelo, df, init=init, **kwargs)
+        except RuntimeError:
+            informe['motivo'] = 'optimizacion'
+        else:
+            sigma_anterior = float(anterior.params['sigma_obs'][0, 0]) * anterior.y_scale
+            sigma_nuevo = float(modelo.params['sigma_obs'][0, 0]) * modelo.y_scale
+            if informe['iteraciones'] >= kwargs.get('iter', MAX_ITERACIONES):
+                informe['motivo'] = 'iteraciones'
+            elif sigma_nuevo > (1 + tolerancia_sigma) * sigma_anterior:
+                informe['motivo'] = 'sigma'
+
+    if informe['motivo'] is not None:
+        informe['modo'] = 'frio'
+        modelo = prophet_copy(anterior)
+        informe['segundos'], informe['iteraciones'] = _ajustar(modelo, df, **kwargs)
+    elif comparar:
+        frio = prophet_copy(anterior)
+        informe['segundos_frio'], informe['iteraciones_frio'] = _ajustar(frio, df, **kwargs)
+        informe['ahorro_segundos'] = informe['segundos_frio'] - informe['segundos']
+        informe['ahorro_iteraciones'] = informe['iteraciones_frio'] - informe['iteraciones']
+    return modelo, informe
@@ -0,0 +1,149 @@
+"""Reducción de puntos antes de graficar series largas.
+
+Con historia horaria de varios años, ``modelo.plot(prediccion)`` y la
+comparación de ``changepoint_prior_scale`` dibujan decenas de miles de puntos,
+aunque el PNG a 300 dpi solo tiene unas 3000 columnas de píxeles. Aquí se
+eligen las filas a dibujar según el ancho de salida, de modo que el costo de
+renderizar depende del ancho y no del largo de la serie:
+
+* :func:`indices_minmax`: por cada columna de píxeles conserva el primer y el
+  último punto y los que tienen el mínimo y el máximo de cada columna de
+  valores (``yhat``, ``yhat_lower``, ``yhat_upper``...). Los picos y valles
+  quedan visibles y la banda de incertidumbre no se angosta.
+* :func:`indices_lttb`: *Largest-Triangle-Three-Buckets*, para líneas suaves
+  con un número fijo de puntos.
+* :func:`indices_rejilla`: un punto por celda de una rejilla de píxeles, para
+  gráficos de dispersión (``'k.'``) sin vaciar la nube de puntos.
+
+Las funciones devuelven posiciones, así que las filas elegidas son filas
+reales de los datos; :func:`reducir` aplica la selección a un DataFrame.
+"""
+
+import numpy as np
+
+DPI_SALIDA = 300
+# lado de la celda de :func:`indices_rejilla`, en píxeles; el marcador '.' de
+# matplotlib mide unos 8 píxeles a 300 dpi
+PIXELES_CELDA = 8
+
+
+def _eje_x(x):
+    """Valores de ``x`` como ``float64`` (las fechas en nanosegundos)."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').view(np.int64)
+    x = x.astype(np.float64)
+    return x - x[0] if len(x) else x
+
+
+def _cubetas(x, n):
+    """Índice de columna de píxeles (``0..n-1``) de cada punto."""
+    rango = x[-1] - x[0]
+    if rango <= 0:
+        return np.zeros(len(x), dtype=np.int64)
+    return np.minimum(((x - x[0]) / rango * n).astype(np.int64), n - 1)
+
+
+def ancho_pixeles(fig, ax=None, dpi=DPI_SALIDA):
+    """Columnas de píxeles que ocupa ``ax`` (o la figura) al guardar con ``dpi``."""
+    fraccion = 1.0 if ax is None else ax.get_position().width
+    return max(1, int(fig.get_figwidth() * fraccion * dpi))
+
+
+def indices_minmax(x, columnas, n):
+    """Posiciones extremas de cada una de ``n`` columnas de píxeles.
+
+    ``x`` debe estar ordenado. Los ``NaN`` de cada columna se ignoran.
+    """
+    x = _eje_x(x)
+    if len(x) <= 4 * n:
+        return np.arange(len(x))
+    cubeta = _cubetas(x, n)
+    cambios = np.flatnonzero(cubeta[1:] != cubeta[:-1])
+    elegidos = [np.r_[0, cambios + 1], np.r_[cambios, len(x) - 1]]
+
+    for y in columnas:
+        y = np.asarray(y, dtype=np.float64)
+        validos = np.flatnonzero(~np.isnan(y))
+        if len(validos) == 0:
+            continue
+        orden = validos[np.lexsort((y[validos], cubeta[validos]))]
+        grupo = cubeta[orden]
+        limites = np.flatnonzero(grupo[1:] != grupo[:-1])
+        elegidos.append(orden[np.r_[0, limites + 1]])
+        elegidos.append(orden[np.r_[limites, len(orden) - 1]])
+    return np.unique(np.concatenate(elegidos))
+
+
+def indices_lttb(x, y, n):
+    """Posiciones elegidas por *Largest-Triangle-Three-Buckets* (``n`` puntos).
+
+    Conserva el primero y el último; de cada uno de los ``n - 2`` tramos
+    intermedios toma el punto que forma el triángulo de mayor área con el punto
+    elegido antes y el promedio del tramo siguiente.
+    """
+    y_original = np.asarray(y, dtype=np.float64)
+    validos = np.flatnonzero(~np.isnan(y_original))
+    total = len(validos)
+    if n >= total or n < 3:
+        return validos
+    x = _eje_x(np.asarray(x)[validos])
+    y = y_original[validos]
+
+    bordes = np.linspace(1, total - 1, n - 1).astype(np.int64)
+    elegidos = np.empty(n, dtype=np.int64)
+    elegidos[0], elegidos[-1] = 0, total - 1
+    a = 0
+    for i in range(n - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        if i + 2 < len(bordes):
+            cx, cy = x[fin:bordes[i + 2]].mean(), y[fin:bordes[i + 2]].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        areas = np.abs((x[a] - cx) * (y[inicio:fin] - y[a]) - (x[a] - x[inicio:fin]) * (cy - y[a]))
+        a = inicio + int(np.argmax(areas))
+        elegidos[i + 1] = a
+    return validos[elegidos]
+
+
+def indices_rejilla(x, y, columnas, filas):
+    """Un punto por celda de una rejilla de ``columnas × filas`` píxeles.
+
+    Pensado para dispersión: la nube se ve igual mientras la celda no sea mayor
+    que el marcador. Se agregan los extremos de cada columna para no perder
+    picos aislados.
+    """
+    y_valores = np.asarray(y, dtype=np.float64)
+    ejex = _eje_x(x)
+    if len(ejex) <= columnas:
+        return np.arange(len(ejex))
+    validos = np.flatnonzero(~np.isnan(y_valores))
+    yv = y_valores[validos]
+    rango = yv.max() - yv.min() if len(yv) else 0
+    fila = np.zeros(len(yv), dtype=np.int64) if rango <= 0 else \
+        np.minimum(((yv - yv.min()) / rango * filas).astype(np.int64), filas - 1)
+    celda = _cubetas(ejex, columnas)[validos] * filas + fila
+    _, primeros = np.unique(celda, return_index=True)
+    return np.union1d(validos[primeros], indices_minmax(x, [y_valores], columnas))
+
+
+def reducir(df, columnas, n, x='ds', metodo='minmax'):
+    """Filas de ``df`` a dibujar con ``n`` columnas de píxeles.
+
+    ``metodo`` es ``'minmax'`` (todas las ``columnas``), ``'lttb'`` (la primera
+    columna, ``n`` puntos) o ``'rejilla'`` (primera columna, celdas cuadradas
+    de ``PIXELES_CELDA`` con la proporción 10:6 de las figuras del curso).
+    """
+    if len(df) <= n:
+        return df
+    if metodo == 'minmax':
+        indices = indices_minmax(df[x].to_numpy(), [df[c].to_numpy() for c in columnas], n)
+    elif metodo == 'lttb':
+        indices = indices_lttb(df[x].to_numpy(), df[columnas[0]].to_numpy(), n)
+    elif metodo == 'rejilla':
+        columnas_rejilla = max(1, n // PIXELES_CELDA)
+        indices = indices_rejilla(df[x].to_numpy(), df[columnas[0]].to_numpy(),
+                                  columnas_rejilla, max(1, columnas_rejilla * 6 // 10))
+    else:
+        raise ValueError(f"Método de reducción desconocido: {metodo!r}")
+    return df.iloc[indices]
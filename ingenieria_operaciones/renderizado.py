@@ -0,0 +1,236 @@
+"""Renderizado de figuras en lote, sin ventanas y en paralelo.
+
+Los ejercicios llaman ``plt.show()`` después de cada ``savefig``, lo que
+bloquea en una interfaz gráfica y genera los PNG uno por uno. Aquí cada figura
+se describe con una :class:`Figura` (ruta de salida, función que la construye
+y sus datos) y :func:`renderizar_lote` las genera en un pool de procesos con el
+backend ``Agg``. El backend solo se elige si nadie lo eligió antes (ni
+``MPLBACKEND`` ni ``matplotlibrc`` ni un ``pyplot`` ya importado), así que usar
+estas funciones desde una sesión interactiva no cierra sus figuras.
+
+Ejemplo::
+
+    from ingenieria_operaciones import renderizado as r
+
+    figuras = [
+        r.Figura('produccion_diaria.png', r.grafico_produccion_diaria, (produccion_diaria,)),
+        r.Figura('costo_promedio_proveedor.png', r.grafico_costos_proveedor, (datos_costos,)),
+    ]
+    tiempos = r.renderizar_lote(figuras, max_workers=4)
+
+Los modelos Prophet se pasan serializados con ``prophet.serialize.model_to_json``
+para no tener que enviar el objeto completo a cada proceso.
+"""
+
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .instrumentacion import etapa
+from .reduccion_puntos import DPI_SALIDA, ancho_pixeles, indices_minmax, reducir
+
+Figura = namedtuple('Figura', ['ruta', 'constructor', 'args'])
+Figura.__doc__ = """Figura a renderizar: ``constructor(*args)`` debe devolver un ``Figure``."""
+
+
+def _sin_backend(matplotlib):
+    try:
+        return matplotlib.get_backend(auto_select=False) is None
+    except TypeError:  # Matplotlib < 3.10
+        return not os.environ.get('MPLBACKEND')
+
+
+def _pyplot():
+    import matplotlib
+    # backend no interactivo (nunca abre ventanas), sin cambiar uno ya elegido
+    if 'matplotlib.pyplot' not in sys.modules and _sin_backend(matplotlib):
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+## Constructores de las figuras de pandas/ejercicios05.py
+
+def grafico_produccion_diaria(produccion_diaria, max_puntos=None):
+    plt = _pyplot()
+    fig = plt.figure(figsize=(12, 6))
+    n = max_puntos or ancho_pixeles(fig)
+    if len(produccion_diaria) > n:
+        produccion_diaria = produccion_diaria.iloc[indices_minmax(produccion_diaria.index, [produccion_diaria], n)]
+    produccion_diaria.plot(
+        kind='line',
+        title='Producción Diaria - Enero 2024',
+        color='green',
+        linewidth=2,
+        marker='o'
+    )
+    plt.xlabel('Fecha')
+    plt.ylabel('Unidades Producidas')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.tight_layout()
+    return fig
+
+
+def grafico_costos_proveedor(datos_costos):
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    datos_costos.plot(
+        x='Proveedor',
+        y='Costo_Promedio',
+        kind='bar',
+        title='Comparación de Costos por Proveedor',
+        color='skyblue',
+        edgecolor='navy',
+        alpha=0.8,
+        ax=ax
+    )
+    ax.set_xlabel('Proveedor')
+    ax.set_ylabel('Costo Promedio (USD)')
+    ax.tick_params(axis='x', rotation=0)
+    ax.grid(axis='y', linestyle='--', alpha=0.6)
+    for p in ax.patches:
+        ax.annotate(f"{p.get_height():.1f}",
+                    (p.get_x() + p.get_width() / 2., p.get_height()),
+                    ha='center', va='center',
+                    xytext=(0, 5),
+                    textcoords='offset points')
+    fig.tight_layout()
+    return fig
+
+
+def grafico_tiempos_ciclo(tiempos_ciclo):
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    tiempos_ciclo['Tiempo'].plot(
+        kind='hist',
+        bins=15,
+        title='Distribución de Tiempos de Ciclo',
+        color='purple',
+        edgecolor='white',
+        alpha=0.7,
+        ax=ax
+    )
+    ax.set_xlabel('Tiempo (minutos)')
+    ax.set_ylabel('Frecuencia')
+    ax.grid(True, linestyle='--', alpha=0.5)
+    mean_val = tiempos_ciclo['Tiempo'].mean()
+    ax.axvline(mean_val, color='red', linestyle='dashed', linewidth=2)
+    ax.text(mean_val + 0.1, ax.get_ylim()[1] * 0.9, f'Media: {mean_val:.2f} min', color='red')
+    fig.tight_layout()
+    return fig
+
+
+def grafico_tiempos_resumen(resumen, bins=15):
+    """Misma figura que :func:`grafico_tiempos_ciclo` a partir de un ``ResumenDistribucion``."""
+    plt = _pyplot()
+    conteos, bordes = resumen.histograma(bins)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.hist(bordes[:-1], bins=bordes, weights=conteos, color='purple', edgecolor='white', alpha=0.7)
+    ax.set_title('Distribución de Tiempos de Ciclo')
+    ax.set_xlabel('Tiempo (minutos)')
+    ax.set_ylabel('Frecuencia')
+    ax.grid(True, linestyle='--', alpha=0.5)
+    mean_val = resumen.media
+    ax.axvline(mean_val, color='red', linestyle='dashed', linewidth=2)
+    ax.text(mean_val + 0.1, ax.get_ylim()[1] * 0.9, f'Media: {mean_val:.2f} min', color='red')
+    fig.tight_layout()
+    return fig
+
+
+## Constructores de las figuras de introduccion_prophet
+
+def grafico_prediccion(modelo_json, prediccion, titulo, xlabel, ylabel, max_puntos=None):
+    """Equivale a ``modelo.plot(prediccion)`` con título y ejes del ejercicio.
+
+    La historia y la predicción se reducen a ``max_puntos`` columnas de píxeles
+    (por defecto el ancho de la figura a 300 dpi) antes de dibujar.
+    """
+    from prophet.serialize import model_from_json
+
+    _pyplot()
+    modelo = model_from_json(modelo_json)
+    n = max_puntos or 10 * DPI_SALIDA
+    modelo.history = reducir(modelo.history, ['y'], n, metodo='rejilla')
+    columnas = [c for c in ('yhat', 'yhat_lower', 'yhat_upper') if c in prediccion]
+    fig = modelo.plot(reducir(prediccion, columnas, n))
+    ax = fig.gca()
+    ax.set_title(titulo, pad=20)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.grid(True, linestyle='--', alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+def grafico_componentes(modelo_json, prediccion):
+    """Equivale a ``modelo.plot_components(prediccion)``.
+
+    Las estrategias ``'analitica'`` y ``'puntual'`` predicen sin muestreo y no
+    traen ``trend_lower``/``trend_upper``; en ese caso las componentes se
+    dibujan sin banda de incertidumbre.
+    """
+    from prophet.serialize import model_from_json
+
+    _pyplot()
+    modelo = model_from_json(modelo_json)
+    fig = modelo.plot_components(prediccion, uncertainty='trend_lower' in prediccion)
+    fig.tight_layout()
+    return fig
+
+
+def grafico_comparacion_cps(df, modelos, max_puntos=None):
+    """Comparación de predicciones para distintos ``changepoint_prior_scale``."""
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    n = max_puntos or ancho_pixeles(fig, ax)
+    df = reducir(df, ['y'], n, metodo='rejilla')
+    ax.plot(df['ds'], df['y'], 'k.', label='Datos Históricos')
+    for cps, forecast in modelos.items():
+        forecast = reducir(forecast, ['yhat'], n)
+        ax.plot(forecast['ds'], forecast['yhat'], label=f'CPS = {cps}')
+    ax.legend()
+    return fig
+
+
+## Renderizado
+
+def renderizar(figura, dpi=DPI_SALIDA):
+    """Construye y guarda una figura. Devuelve ``(ruta, segundos)``."""
+    plt = _pyplot()
+    inicio = time.perf_counter()
+    with etapa('plot', figura=figura.ruta):
+        fig = figura.constructor(*figura.args)
+        try:
+            fig.savefig(figura.ruta, dpi=dpi)
+        finally:
+            plt.close(fig)
+    return figura.ruta, time.perf_counter() - inicio
+
+
+def renderizar_lote(figuras, max_workers=None, dpi=DPI_SALIDA, reportar=print):
+    """Renderiza ``figuras`` en un pool de procesos sin bloquear en ninguna ventana.
+
+    Devuelve un diccionario ``ruta -> segundos`` en el mismo orden de
+    ``figuras``. ``reportar`` recibe una línea por figura terminada; con
+    ``None`` no se informa nada. ``max_workers=1`` renderiza en el proceso
+    actual.
+    """
+    figuras = list(figuras)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(figuras) or 1))
+
+    if max_workers == 1:
+        resultados = [renderizar(figura, dpi) for figura in figuras]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futuros = [pool.submit(renderizar, figura, dpi) for figura in figuras]
+            resultados = [futuro.result() for futuro in futuros]
+
+    tiempos = dict(resultados)
+    if reportar is not None:
+        for ruta, segundos in tiempos.items():
+            reportar(f"✓ {ruta} renderizado en {segundos:.2f} s")
+    return tiempos
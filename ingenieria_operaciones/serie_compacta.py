@@ -0,0 +1,149 @@
+"""Representación compacta de series de frecuencia regular.
+
+``df_produccion`` guarda cada hora como una fila con ``ds`` (datetime64, 8
+bytes) e ``y`` (float64, 8 bytes). Si la frecuencia es regular la columna
+``ds`` sobra: basta con el instante inicial y el paso. :class:`SerieCompacta`
+guarda solo eso más los valores en ``float32`` o como enteros escalados
+(``int16``/``int32`` con ``decimales`` fijos, sin pérdida para datos
+redondeados como ``np.round(..., 2)``).
+
+Las columnas ``ds``/``y`` se construyen solo cuando se piden y la selección por
+fecha devuelve vistas sin copiar los valores::
+
+    ts = SerieCompacta.desde_dataframe(df_produccion, tipo='entero', decimales=2)
+    ts['2024-01']                      # un mes
+    ts['2024-01-03':'2024-01-07']      # rango de fechas (extremos incluidos)
+    ts.a_dataframe()                   # DataFrame ds/y
+    ts.memoria()                       # bytes frente al DataFrame
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def intervalo_fecha(clave):
+    """Inicio y fin de una fecha posiblemente parcial: '2024-01' cubre todo enero."""
+    if isinstance(clave, str):
+        periodo = pd.Period(clave)
+        return periodo.start_time, periodo.end_time
+    fecha = pd.Timestamp(clave)
+    return fecha, fecha
+
+
+class SerieCompacta:
+    """Serie regular guardada como ``inicio``, ``paso`` y un arreglo de valores."""
+
+    __slots__ = ('inicio', 'paso', 'valores', 'escala')
+
+    def __init__(self, inicio, paso, valores, escala=None):
+        self.inicio = pd.Timestamp(inicio)
+        self.paso = pd.Timedelta(paso)
+        self.valores = valores
+        self.escala = escala  # None: valores reales; si no, y = valores / escala
+
+    @classmethod
+    def desde_dataframe(cls, df, tipo='float32', decimales=2):
+        """Construye la serie desde un DataFrame ``ds``/``y`` de frecuencia regular.
+
+        ``tipo`` es ``'float32'`` o ``'entero'`` (escala ``10**decimales`` en el
+        entero más pequeño que contenga los datos).
+        """
+        ds = pd.DatetimeIndex(df['ds'])
+        y = df['y'].to_numpy(dtype=np.float64)
+        if len(ds) < 2:
+            raise ValueError("Se necesitan al menos dos observaciones para inferir la frecuencia")
+        paso = ds[1] - ds[0]
+        if paso <= pd.Timedelta(0) or not (np.diff(ds.to_numpy()) == paso.to_timedelta64()).all():
+            raise ValueError("La serie no tiene una frecuencia regular")
+
+        if tipo == 'float32':
+            return cls(ds[0], paso, y.astype(np.float32))
+        if tipo != 'entero':
+            raise ValueError(f"Tipo desconocido: {tipo!r}")
+        if np.isnan(y).any():
+            raise ValueError("Los enteros escalados no admiten valores faltantes; use tipo='float32'")
+        escala = 10**decimales
+        escalados = np.rint(y * escala)
+        minimo, maximo = escalados.min(), escalados.max()
+        for dtype in (np.int16, np.int32, np.int64):
+            # límites como potencias de dos: exactos también en float64 para int64
+            limite = 2.0 ** (np.iinfo(dtype).bits - 1)
+            if -limite <= minimo and maximo < limite:
+                return cls(ds[0], paso, escalados.astype(dtype), escala)
+        raise ValueError(f"Los valores escalados por {escala} van de {minimo:g} a {maximo:g} y no caben "
+                         f"en int64; use menos decimales o tipo='float32'")
+
+    def __len__(self):
+        return len(self.valores)
+
+    def __repr__(self):
+        return (f"SerieCompacta(inicio={self.inicio}, paso={self.paso}, n={len(self)}, "
+                f"dtype={self.valores.dtype}{'' if self.escala is None else f', escala={self.escala}'})")
+
+    ## Vistas bajo demanda
+
+    @property
+    def fin(self):
+        return self.inicio + self.paso * (len(self) - 1)
+
+    def indice(self):
+        """``DatetimeIndex`` de la serie (se construye en cada llamada)."""
+        return pd.date_range(self.inicio, periods=len(self), freq=self.paso)
+
+    def y(self):
+        """Valores como ``float64``."""
+        if self.escala is None:
+            return self.valores.astype(np.float64)
+        return self.valores / self.escala
+
+    def a_serie(self, nombre=None):
+        """``pd.Series`` indexada por fecha (por ejemplo para ``resample``)."""
+        return pd.Series(self.y(), index=self.indice(), name=nombre)
+
+    def a_dataframe(self):
+        """DataFrame con columnas ``ds`` e ``y`` como el de los ejercicios."""
+        return pd.DataFrame({'ds': self.indice(), 'y': self.y()})
+
+    ## Selección por fecha
+
+    def _posicion(self, fecha, hacia_arriba):
+        desplazamiento = (pd.Timestamp(fecha) - self.inicio) / self.paso
+        posicion = int(np.ceil(desplazamiento) if hacia_arriba else np.floor(desplazamiento))
+        return min(max(posicion, 0), len(self) - 1 if not hacia_arriba else len(self))
+
+    def _rebanar(self, desde, hasta):
+        return SerieCompacta(self.inicio + self.paso * desde, self.paso,
+                             self.valores[desde:hasta], self.escala)
+
+    def __getitem__(self, clave):
+        if isinstance(clave, slice):
+            if clave.step is not None:
+                raise ValueError("La selección por fechas no admite paso")
+            desde = 0 if clave.start is None else self._posicion(intervalo_fecha(clave.start)[0], True)
+            hasta = len(self) if clave.stop is None else self._posicion(intervalo_fecha(clave.stop)[1], False) + 1
+            if clave.stop is not None and intervalo_fecha(clave.stop)[1] < self.inicio:
+                hasta = 0
+            return self._rebanar(desde, max(desde, hasta))
+
+        inicio, fin = intervalo_fecha(clave)
+        if fin - inicio < self.paso:
+            # la clave tiene la misma resolución que la serie: un solo valor
+            posicion = (inicio - self.inicio) / self.paso
+            if posicion != int(posicion) or not 0 <= posicion < len(self):
+                raise KeyError(clave)
+            valor = self.valores[int(posicion)]
+            return float(valor) if self.escala is None else valor / self.escala
+        return self[clave:clave]
+
+    ## Memoria
+
+    def memoria(self):
+        """Bytes usados frente a la forma DataFrame ``ds``/``y`` (datetime64 + float64)."""
+        compacta = self.valores.nbytes + 16  # inicio y paso
+        dataframe = len(self) * (np.dtype('datetime64[ns]').itemsize + np.dtype(np.float64).itemsize)
+        return {
+            'bytes_compacta': compacta,
+            'bytes_dataframe': dataframe,
+            'ahorro_bytes': dataframe - compacta,
+            'proporcion': compacta / dataframe if dataframe else 0.0,
+        }
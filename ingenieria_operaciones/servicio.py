@@ -0,0 +1,261 @@
+"""Servicio HTTP local de pronósticos sobre modelos Prophet ya entrenados.
+
+Evita volver a correr un script completo (que reentrena y regrafica) para
+obtener un pronóstico. Los modelos se guardan con :func:`guardar_modelo` como
+``<directorio>/<serie>.json`` y el servicio los carga una sola vez, los
+mantiene en memoria con desalojo LRU y responde::
+
+    GET /pronostico?serie=demanda&periodos=30[&freq=D]
+    GET /metricas
+
+Sin ``freq`` se usa la frecuencia con la que se entrenó el modelo (``D`` para
+demanda, ``h`` para producción).
+
+Las solicitudes concurrentes para el mismo modelo se agrupan durante
+``ventana_ms`` milisegundos y se resuelven con una sola llamada a ``predict``
+sobre el horizonte más largo del lote. Los lotes de un mismo modelo (por
+ejemplo con distinta ``freq``) se predicen de a uno, porque ``predecir`` cambia
+temporalmente ``uncertainty_samples`` del modelo compartido; el candado de
+cada modelo desaparece con él al ser desalojado. Una solicitud que no termina
+de llegar en ``tiempo_lectura`` segundos se responde con 408. ``/metricas``
+informa las latencias p50 y p99.
+
+Uso::
+
+    python -m ingenieria_operaciones.servicio --modelos modelos --puerto 8765
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+import weakref
+from http import HTTPStatus
+from collections import OrderedDict, deque
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+NOMBRE_VALIDO = re.compile(r'^[\w.-]+$')
+
+
+class ModeloNoEncontrado(LookupError):
+    """No hay ``<serie>.json`` en el directorio de modelos."""
+
+
+def guardar_modelo(directorio, serie, modelo):
+    """Guarda ``modelo`` entrenado como ``<directorio>/<serie>.json``."""
+    from prophet.serialize import model_to_json
+
+    if not NOMBRE_VALIDO.match(serie):
+        raise ValueError(f"Nombre de serie inválido: {serie!r}")
+    os.makedirs(directorio, exist_ok=True)
+    with open(os.path.join(directorio, f'{serie}.json'), 'w', encoding='utf-8') as archivo:
+        archivo.write(model_to_json(modelo))
+
+
+class ServicioPronostico:
+    """Modelos en memoria (LRU), micro-lotes por modelo y métricas de latencia."""
+
+    def __init__(self, directorio_modelos, capacidad=32, ventana_ms=5, intervalos='completa',
+                 muestras_latencia=10_000, tiempo_lectura=10):
+        self.directorio_modelos = directorio_modelos
+        self.capacidad = capacidad
+        self.ventana = ventana_ms / 1000
+        self.intervalos = intervalos
+        self._modelos = OrderedDict()
+        self._cargando = {}
+        self._frecuencias = {}
+        # un candado por objeto modelo: se libera cuando el modelo desalojado deja de usarse
+        self._bloqueos = weakref.WeakKeyDictionary()
+        self.tiempo_lectura = tiempo_lectura
+        self._pendientes = {}
+        self._latencias = deque(maxlen=muestras_latencia)
+        self.solicitudes = 0
+        self.lotes = 0
+
+    ## Modelos
+
+    async def _modelo(self, serie):
+        if serie in self._modelos:
+            self._modelos.move_to_end(serie)
+            return self._modelos[serie]
+        if serie not in self._cargando:
+            self._cargando[serie] = asyncio.get_running_loop().run_in_executor(None, self._cargar, serie)
+        try:
+            modelo = await self._cargando[serie]
+        finally:
+            self._cargando.pop(serie, None)
+        self._modelos[serie] = modelo
+        while len(self._modelos) > self.capacidad:
+            desalojada, _ = self._modelos.popitem(last=False)
+            self._frecuencias.pop(desalojada, None)
+        return modelo
+
+    async def frecuencia(self, serie):
+        """Frecuencia de la historia con la que se entrenó el modelo de ``serie``."""
+        if serie not in self._frecuencias:
+            fechas = pd.DatetimeIndex((await self._modelo(serie)).history['ds'])
+            self._frecuencias[serie] = pd.infer_freq(fechas) or to_offset(fechas.to_series().diff().median()).freqstr
+        return self._frecuencias[serie]
+
+    def _cargar(self, serie):
+        from prophet.serialize import model_from_json
+
+        if not NOMBRE_VALIDO.match(serie):
+            raise ModeloNoEncontrado(serie)
+        ruta = os.path.join(self.directorio_modelos, f'{serie}.json')
+        if not os.path.exists(ruta):
+            raise ModeloNoEncontrado(serie)
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            return model_from_json(archivo.read())
+
+    ## Micro-lotes
+
+    async def pronosticar(self, serie, periodos, freq=None):
+        """Pronóstico de ``periodos`` futuros de ``serie`` como diccionario de listas.
+
+        Con ``freq=None`` se usa la frecuencia de entrenamiento del modelo.
+        """
+        llave = (serie, freq or await self.frecuencia(serie))
+        futuro = asyncio.get_running_loop().create_future()
+        lote = self._pendientes.get(llave)
+        if lote is None:
+            lote = self._pendientes[llave] = []
+            asyncio.create_task(self._resolver_lote(llave))
+        lote.append((periodos, futuro))
+        return await futuro
+
+    async def _resolver_lote(self, llave):
+        await asyncio.sleep(self.ventana)
+        lote = self._pendientes.pop(llave)
+        serie, freq = llave
+        try:
+            modelo = await self._modelo(serie)
+            horizonte = max(periodos for periodos, _ in lote)
+            async with self._bloqueos.setdefault(modelo, asyncio.Lock()):
+                prediccion = await asyncio.get_running_loop().run_in_executor(
+                    None, self._predecir, modelo, horizonte, freq)
+            self.lotes += 1
+        except Exception as error:
+            for _, futuro in lote:
+                futuro.set_exception(error)
+            return
+        for periodos, futuro in lote:
+            futuro.set_result({columna: valores[:periodos] for columna, valores in prediccion.items()})
+
+    def _predecir(self, modelo, periodos, freq):
+        from .intervalos import predecir
+
+        futuro = modelo.make_future_dataframe(periods=periodos, freq=freq, include_history=False)
+        prediccion = predecir(modelo, futuro, self.intervalos)
+        # con 'puntual' los intervalos son NaN, que en JSON se envían como null
+        return {
+            'ds': prediccion['ds'].dt.strftime('%Y-%m-%d %H:%M:%S').tolist(),
+            **{columna: prediccion[columna].astype(object).where(prediccion[columna].notna(), None).tolist()
+               for columna in ('yhat', 'yhat_lower', 'yhat_upper')},
+        }
+
+    ## Métricas
+
+    def metricas(self):
+        latencias = np.array(self._latencias) * 1000
+        return {
+            'solicitudes': self.solicitudes,
+            'lotes': self.lotes,
+            'modelos_en_memoria': list(self._modelos),
+            'p50_ms': float(np.percentile(latencias, 50)) if len(latencias) else None,
+            'p99_ms': float(np.percentile(latencias, 99)) if len(latencias) else None,
+        }
+
+    ## HTTP
+
+    async def atender(self, lector, escritor):
+        inicio = time.perf_counter()
+        try:
+            partes = (await asyncio.wait_for(self._leer_solicitud(lector), self.tiempo_lectura)).split()
+            if len(partes) < 2 or partes[0] != 'GET':
+                estado, cuerpo = 405, {'error': 'solo se admite GET'}
+            else:
+                estado, cuerpo = await self._enrutar(urlsplit(partes[1]))
+        except asyncio.TimeoutError:
+            estado, cuerpo = 408, {'error': 'la solicitud no llegó a tiempo'}
+        except Exception as error:
+            estado, cuerpo = 500, {'error': f'{type(error).__name__}: {error}'}
+
+        datos = json.dumps(cuerpo, ensure_ascii=False, allow_nan=False).encode('utf-8')
+        escritor.write(
+            f'HTTP/1.1 {estado} {HTTPStatus(estado).phrase}\r\n'
+            f'Content-Type: application/json; charset=utf-8\r\n'
+            f'Content-Length: {len(datos)}\r\nConnection: close\r\n\r\n'.encode('latin-1') + datos)
+        await escritor.drain()
+        escritor.close()
+        if estado == 200:
+            self._latencias.append(time.perf_counter() - inicio)
+
+    @staticmethod
+    async def _leer_solicitud(lector):
+        """Línea de solicitud (``GET /ruta HTTP/1.1``); los encabezados se ignoran."""
+        linea = (await lector.readline()).decode('latin-1')
+        while (await lector.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+        return linea
+
+    async def _enrutar(self, url):
+        if url.path == '/metricas':
+            return 200, self.metricas()
+        if url.path != '/pronostico':
+            return 404, {'error': f'ruta desconocida: {url.path}'}
+        parametros = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        serie = parametros.get('serie')
+        try:
+            periodos = int(parametros.get('periodos', 30))
+        except ValueError:
+            return 400, {'error': "'periodos' debe ser un entero"}
+        if not serie or periodos <= 0:
+            return 400, {'error': "se requieren 'serie' y 'periodos' > 0"}
+        freq = parametros.get('freq')
+        if freq is not None:
+            try:
+                to_offset(freq)
+            except ValueError:
+                return 400, {'error': f"frecuencia inválida: {freq!r}"}
+        self.solicitudes += 1
+        try:
+            pronostico = await self.pronosticar(serie, periodos, freq)
+        except ModeloNoEncontrado:
+            return 404, {'error': f'no hay modelo para la serie {serie!r}'}
+        return 200, {'serie': serie, **pronostico}
+
+    async def servir(self, host='127.0.0.1', puerto=8765):
+        servidor = await asyncio.start_server(self.atender, host, puerto)
+        print(f"✓ Servicio de pronósticos en http://{host}:{puerto}")
+        async with servidor:
+            await servidor.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modelos', default='modelos', help='directorio con <serie>.json')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--capacidad', type=int, default=32, help='modelos en memoria')
+    parser.add_argument('--ventana-ms', type=float, default=5)
+    parser.add_argument('--tiempo-lectura', type=float, default=10, help='segundos para recibir la solicitud')
+    parser.add_argument('--intervalos', default='completa',
+                        choices=['completa', 'reducida', 'analitica', 'puntual'])
+    args = parser.parse_args(argv)
+    servicio = ServicioPronostico(args.modelos, args.capacidad, args.ventana_ms, args.intervalos,
+                                  tiempo_lectura=args.tiempo_lectura)
+    try:
+        asyncio.run(servicio.servir(args.host, args.puerto))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
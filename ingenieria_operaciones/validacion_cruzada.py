@@ -0,0 +1,134 @@
+"""Validación cruzada de origen móvil, en paralelo y con caché.
+
+Para cada fecha de corte (``cutoff``) se entrena el modelo con los datos hasta
+esa fecha y se predice el ``horizonte`` siguiente, igual que
+``prophet.diagnostics.cross_validation``. A diferencia de Prophet, los cortes
+se cuentan desde el inicio de la serie y no desde el final, de modo que al
+agregar datos los cortes anteriores no se mueven. Los cortes se reparten entre
+procesos y cada uno se guarda en disco con una llave que depende de los datos
+de entrenamiento, la configuración y las fechas evaluadas: al volver a
+ejecutar solo se calculan los cortes nuevos (por ejemplo, cuando llegan datos
+recientes).
+
+Ejemplo::
+
+    cv = validacion_cruzada(df_demanda, horizonte='14 days', periodo='7 days',
+                            inicial='56 days', config=CONFIG_DEMANDA)
+    metricas(cv)          # MAE, MAPE y cobertura por horizonte
+"""
+
+import hashlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .cache_modelos import CacheModelos, clave_modelo
+from .instrumentacion import etapa
+from .modelos import CONFIG_DEMANDA, crear_modelo
+
+
+def generar_cortes(df, horizonte, periodo, inicial):
+    """Fechas de corte desde la más antigua.
+
+    El primer corte deja ``inicial`` de entrenamiento y los siguientes avanzan
+    de ``periodo`` en ``periodo`` mientras quede ``horizonte`` de datos para
+    evaluar. Prophet ancla los cortes en el final de la serie; aquí se anclan
+    en el inicio para que, al llegar datos nuevos, los cortes existentes (y sus
+    llaves de caché) no cambien y solo se agreguen cortes al final.
+    """
+    horizonte, periodo, inicial = map(pd.Timedelta, (horizonte, periodo, inicial))
+    inicio, fin = df['ds'].min(), df['ds'].max()
+    corte = inicio + inicial
+    cortes = []
+    while corte <= fin - horizonte:
+        cortes.append(corte)
+        corte += periodo
+    if not cortes:
+        raise ValueError("No hay datos suficientes para ningún corte; reduzca 'inicial' u 'horizonte'")
+    return cortes
+
+
+def _clave_corte(entrenamiento, evaluacion, config):
+    h = hashlib.sha256(clave_modelo(entrenamiento, **config).encode('ascii'))
+    h.update(evaluacion['ds'].to_numpy(dtype='datetime64[ns]').tobytes())
+    h.update(evaluacion['y'].to_numpy(dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+def evaluar_corte(df, corte, horizonte, config, directorio_cache=None, semilla=1405):
+    """Entrena hasta ``corte`` y predice ``(corte, corte + horizonte]``.
+
+    Devuelve un DataFrame con ``ds``, ``yhat``, ``yhat_lower``, ``yhat_upper``,
+    ``y`` y ``cutoff``. Con ``directorio_cache`` se reutilizan el modelo
+    entrenado y la predicción si ya se calcularon.
+    """
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    entrenamiento = df[df['ds'] <= corte]
+    evaluacion = df[(df['ds'] > corte) & (df['ds'] <= corte + pd.Timedelta(horizonte))]
+
+    ruta = None
+    if directorio_cache is not None:
+        ruta = os.path.join(directorio_cache, 'cortes', f'{_clave_corte(entrenamiento, evaluacion, config)}.pkl')
+        if os.path.exists(ruta):
+            return pd.read_pickle(ruta)
+
+    with etapa('fit', cutoff=str(corte), filas=len(entrenamiento)):
+        if directorio_cache is not None:
+            modelo = CacheModelos(os.path.join(directorio_cache, 'modelos')).obtener_o_ajustar(
+                entrenamiento, **config)
+        else:
+            modelo = crear_modelo(**config)
+            modelo.fit(entrenamiento)
+    with etapa('predict', cutoff=str(corte), filas=len(evaluacion)):
+        np.random.seed(semilla)
+        prediccion = modelo.predict(evaluacion[['ds']])
+
+    resultado = prediccion[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].assign(
+        y=evaluacion['y'].to_numpy(), cutoff=corte)
+    if ruta is not None:
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        temporal = f'{ruta}.{os.getpid()}.tmp'
+        resultado.to_pickle(temporal)
+        os.replace(temporal, ruta)
+    return resultado
+
+
+def validacion_cruzada(df, horizonte='30 days', periodo='15 days', inicial='60 days',
+                       config=None, max_workers=None, directorio_cache='.cache_modelos',
+                       semilla=1405):
+    """Evalúa el modelo en todos los cortes en un pool de procesos.
+
+    ``config`` son los argumentos de ``Prophet`` (por defecto ``CONFIG_DEMANDA``);
+    ``directorio_cache=None`` desactiva el caché. Devuelve las predicciones de
+    todos los cortes concatenadas en orden de corte.
+    """
+    config = CONFIG_DEMANDA if config is None else config
+    df = df[['ds', 'y']].sort_values('ds').reset_index(drop=True)
+    cortes = generar_cortes(df, horizonte, periodo, inicial)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(cortes)))
+
+    args = (horizonte, config, directorio_cache, semilla)
+    if max_workers == 1:
+        partes = [evaluar_corte(df, corte, *args) for corte in cortes]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futuros = [pool.submit(evaluar_corte, df, corte, *args) for corte in cortes]
+            partes = [futuro.result() for futuro in futuros]
+    return pd.concat(partes, ignore_index=True)
+
+
+def metricas(cv):
+    """MAE, MAPE y cobertura del intervalo agrupados por horizonte (``ds - cutoff``)."""
+    error = cv['y'] - cv['yhat']
+    tabla = pd.DataFrame({
+        'horizon': cv['ds'] - cv['cutoff'],
+        'mae': error.abs(),
+        'mape': (error / cv['y']).abs().where(cv['y'] != 0),
+        'coverage': ((cv['y'] >= cv['yhat_lower']) & (cv['y'] <= cv['yhat_upper'])).astype(float),
+    })
+    return tabla.groupby('horizon').mean()
@@ -163,8 +163,8 @@ ax.plot(df_demanda['ds'], df_demanda['y'], 'k.', label='Datos Históricos')
 for cps, forecast in modelos.items():
     ax.plot(forecast['ds'], forecast['yhat'], label=f'CPS = {cps}')
 ax.legend()
-plt.show()
 plt.savefig('comparacion_cps.png', dpi=300)
+plt.show()
 print("✓ Gráfico de comparación de changepoint_prior_scale guardado como 'comparacion_cps.png'")
 
 import pandas as pd